@@ -1,7 +1,8 @@
-import asyncio
 import logging
 import os
 import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import customtkinter as ctk
 from PIL import Image
@@ -14,6 +15,13 @@ from gui.tooltip_manager import TooltipManager
 from gui.xlite_manager import XliteManager
 from utilities import global_variables
 from utilities import utils
+from utilities.download_manager import download_manager
+from utilities.health_scheduler import HealthScheduler
+from utilities.process_registry import ProcessRegistry
+from utilities.process_sampler import ProcessSampler, ProcessSnapshot
+from utilities.process_supervisor import child_exit_watcher, RestartSupervisor
+from utilities.process_telemetry import ProcessTelemetry
+from utilities.rpc_util import rpc_transport
 
 asyncio_logger = logging.getLogger('asyncio')
 asyncio_logger.setLevel(logging.WARNING)
@@ -23,6 +31,17 @@ from gui.constants import tooltip_bg_color, MAIN_FRAMES_STICKY, TITLE_FRAMES_STI
 
 ctk.set_default_color_theme(global_variables.themepath)
 
+# panel -> (manager class, GUI attribute, grid row, title columnspan, panels whose manager must exist before its frame)
+PANELS = {
+    'blocknet': (BlocknetManager, 'blocknet_manager', 1, 2, ()),
+    'blockdx': (BlockDXManager, 'blockdx_manager', 2, 2, ('blocknet',)),
+    'xlite': (XliteManager, 'xlite_manager', 3, 2, ('blocknet',)),
+    'binary': (BinaryManager, 'binary_manager', 0, 5, ('blocknet', 'blockdx', 'xlite')),
+}
+STARTUP_POLL_MS = 20
+PANEL_PADX = 10
+PANEL_PADY = 5
+
 
 class Blocknet_AIO_GUI(ctk.CTk):
     """Main GUI class for Blocknet AIO application."""
@@ -30,6 +49,8 @@ class Blocknet_AIO_GUI(ctk.CTk):
     def __init__(self):
         """Initialize the Blocknet AIO GUI application."""
         super().__init__()
+        self.startup_started: float = time.perf_counter()
+        self.startup_timings: dict = {}
         self.install_greyed_img = None
         self.install_img = None
         self.delete_greyed_img = None
@@ -60,35 +81,140 @@ class Blocknet_AIO_GUI(ctk.CTk):
         self.time_disable_button: int = 3000
 
         self.tooltip_manager: TooltipManager = TooltipManager(self)
-
-        self.blocknet_manager: BlocknetManager = BlocknetManager(self)
-        self.binary_manager: BinaryManager = BinaryManager(self)
-        self.blockdx_manager: BlockDXManager = BlockDXManager(self)
-        self.xlite_manager: XliteManager = XliteManager(self)
-
-    async def setup_management_sections(self) -> None:
-        """Initialize and setup all management sections asynchronously."""
-        await asyncio.gather(
-            self.binary_manager.setup(),
-            self.blocknet_manager.setup(),
-            self.blockdx_manager.setup(),
-            self.xlite_manager.setup()
-        )
+        self.process_registry: ProcessRegistry = ProcessRegistry()
+        telemetry_interval = self.cfg.get('telemetry_interval', 5) if self.cfg else 5
+        self.process_telemetry: ProcessTelemetry = ProcessTelemetry(interval=telemetry_interval)
+        self.process_sampler: ProcessSampler = ProcessSampler(self.process_registry, telemetry=self.process_telemetry)
+        self.last_process_snapshot_timestamp: float = 0
+        self.health_scheduler: HealthScheduler = HealthScheduler()
+        # optional cap shared by every download, in KB/s
+        bandwidth_limit = self.cfg.get('download_bandwidth_limit') if self.cfg else None
+        if bandwidth_limit:
+            download_manager.set_bandwidth_limit(bandwidth_limit * 1024)
+        child_exit_watcher.add_start_listener(self.on_child_started)
+        child_exit_watcher.add_exit_listener(self.on_child_exit)
+
+        # built in the background by init_setup, each panel fills in once its manager is ready
+        self.blocknet_manager: BlocknetManager = None
+        self.binary_manager: BinaryManager = None
+        self.blockdx_manager: BlockDXManager = None
+        self.xlite_manager: XliteManager = None
+        self.manager_futures: dict = {}
+        self.constructed_panels: set = set()
+        self.built_panels: set = set()
+        self.failed_panels: set = set()
+        self.placeholder_frames: dict = {}
+
+        self.restart_supervisor: RestartSupervisor = RestartSupervisor()
+        # start functions are looked up when a restart happens, the managers do not exist yet
+        self.restart_supervisor.register("blocknet", lambda: self.blocknet_manager.utility.start_blocknet(),
+                                         enabled=bool(self.cfg and self.cfg.get('auto_restart_blocknet')),
+                                         is_running=lambda: self.blocknet_manager.blocknet_process_running)
+        # xlite-daemon is spawned by XLite, restarting the wallet brings the daemon back
+        self.restart_supervisor.register("xlite_daemon", lambda: self.binary_manager.restart_xlite(),
+                                         enabled=bool(self.cfg and self.cfg.get('auto_restart_xlite_daemon')),
+                                         is_running=lambda: self.xlite_manager.daemon_process_running)
 
     def init_setup(self) -> None:
-        """Initialize the GUI setup, including layout, images, and frame configuration."""
+        """Show the window shell right away, the managers are built concurrently in the background."""
+        phase_start = time.perf_counter()
         self.title(widgets_strings.app_title_string)
         self.resizable(False, False)
         self.setup_load_images()
-        self.after(0, self.check_processes)
-        asyncio.run(self.setup_management_sections())
-        self.setup_tooltips()
-        self.init_grid()
+        self.init_placeholders()
 
         self.protocol("WM_DELETE_WINDOW", self.on_close)
         signal.signal(signal.SIGINT, self.handle_signal)
         signal.signal(signal.SIGTERM, self.handle_signal)
 
+        self.process_sampler.start()
+        self.health_scheduler.start()
+        self.update_idletasks()
+        self.record_startup_phase("skeleton", time.perf_counter() - phase_start)
+
+        executor = ThreadPoolExecutor(max_workers=len(PANELS), thread_name_prefix="ManagerInit")
+        for name, (manager_class, *_) in PANELS.items():
+            self.manager_futures[name] = executor.submit(self.build_manager, manager_class)
+        executor.shutdown(wait=False)
+        self.after(STARTUP_POLL_MS, self.poll_startup)
+
+    def build_manager(self, manager_class):
+        """Run in a worker thread, managers only create their Tk widgets later in setup()."""
+        start = time.perf_counter()
+        manager = manager_class(self)
+        return manager, time.perf_counter() - start
+
+    def poll_startup(self) -> None:
+        """Attach the managers built so far and build the panels whose dependencies are met."""
+        for name, future in self.manager_futures.items():
+            if name in self.constructed_panels or not future.done():
+                continue
+            try:
+                manager, duration = future.result()
+            except Exception as e:
+                logging.exception(f"Failed to initialize {name} manager: {e}")
+                self.constructed_panels.add(name)
+                self.fail_panel(name)
+                continue
+            setattr(self, PANELS[name][1], manager)
+            self.constructed_panels.add(name)
+            self.record_startup_phase(f"init {name}", duration)
+
+        for name, (_, attribute, row, title_columnspan, dependencies) in PANELS.items():
+            if name in self.built_panels:
+                continue
+            failed_dependencies = [dependency for dependency in dependencies if dependency in self.failed_panels]
+            if failed_dependencies:
+                logging.error(f"Not building the {name} panel, {', '.join(failed_dependencies)} failed")
+                self.fail_panel(name)
+                continue
+            if getattr(self, attribute) is None:
+                continue
+            if not all(getattr(self, PANELS[dependency][1]) is not None for dependency in dependencies):
+                continue
+            phase_start = time.perf_counter()
+            manager = getattr(self, attribute)
+            try:
+                manager.setup()
+            except Exception as e:
+                logging.exception(f"Failed to set up {name} panel: {e}")
+                self.fail_panel(name)
+                continue
+            self.placeholder_frames.pop(name).destroy()
+            self.grid_panel(manager.frame_manager, row, title_columnspan)
+            self.built_panels.add(name)
+            self.record_startup_phase(f"panel {name}", time.perf_counter() - phase_start)
+
+        if len(self.built_panels) < len(PANELS):
+            self.after(STARTUP_POLL_MS, self.poll_startup)
+            return
+        if self.failed_panels:
+            logging.error("Startup incomplete, process monitoring disabled")
+            return
+        self.setup_tooltips()
+        self.after(0, self.check_processes)
+        self.record_startup_phase("total", time.perf_counter() - self.startup_started)
+        logging.info("Startup timings: " + " | ".join(f"{phase} {duration:.2f}s"
+                                                       for phase, duration in self.startup_timings.items()))
+
+    def fail_panel(self, name: str) -> None:
+        """Leave the placeholder of a panel that cannot be built, with an error in place of the loading text."""
+        self.placeholder_frames[name].winfo_children()[0].configure(text=widgets_strings.loading_panel_failed_string)
+        self.failed_panels.add(name)
+        self.built_panels.add(name)
+
+    def record_startup_phase(self, phase: str, duration: float) -> None:
+        self.startup_timings[phase] = duration
+        logging.debug(f"Startup: {phase} took {duration:.2f}s")
+
+    def init_placeholders(self) -> None:
+        """Grid an empty frame per panel so the window has its final layout before the managers exist."""
+        for name, (_, _, row, _, _) in PANELS.items():
+            frame = ctk.CTkFrame(master=self)
+            ctk.CTkLabel(frame, text=widgets_strings.loading_panel_string).grid(row=0, column=0, padx=10, pady=10)
+            frame.grid(row=row, column=0, padx=PANEL_PADX, pady=PANEL_PADY, sticky=MAIN_FRAMES_STICKY)
+            self.placeholder_frames[name] = frame
+
     def setup_load_images(self) -> None:
         """Load and set up images for use in the GUI."""
         resize = (65, 30)
@@ -179,6 +305,9 @@ class Blocknet_AIO_GUI(ctk.CTk):
         self.tooltip_manager.register_tooltip(self.binary_manager.frame_manager.install_delete_xlite_button,
                                               msg=global_variables.xlite_release_url, delay=1, follow=True,
                                               bg_color=tooltip_bg_color, border_width=2, justify="left")
+        self.tooltip_manager.register_tooltip(self.blocknet_manager.frame_manager.download_bootstrap_button,
+                                              msg=global_variables.conf_data.blocknet_bootstrap_url, delay=1,
+                                              follow=True, bg_color=tooltip_bg_color, border_width=2, justify="left")
         self.tooltip_manager.register_tooltip(self.binary_manager.frame_manager.blocknet_start_close_button, msg='',
                                               delay=1, follow=True, bg_color=tooltip_bg_color, border_width=2,
                                               justify="left")
@@ -195,43 +324,14 @@ class Blocknet_AIO_GUI(ctk.CTk):
                                               msg=widgets_strings.tooltip_blockdx_label_msg, delay=1.0, border_width=2,
                                               follow=True, bg_color=tooltip_bg_color)
 
-    def init_grid(self) -> None:
-        """Initialize the grid layout for GUI components."""
-        x: int = 0
-        y: int = 0
-        padx_main_frame: int = 10
-        pady_main_frame: int = 5
-        self.grid_frames(x, y, padx_main_frame, pady_main_frame)
-        self.binary_manager.frame_manager.grid_widgets(x, y)
-        self.blocknet_manager.frame_manager.grid_widgets(x, y)
-        self.blockdx_manager.frame_manager.grid_widgets(x, y)
-        self.xlite_manager.frame_manager.grid_widgets(x, y)
-
-    def grid_frames(self, x: int, y: int, padx_main_frame: int, pady_main_frame: int) -> None:
-        """Grid layout for frames in the GUI."""
-        self.binary_manager.frame_manager.master_frame.grid(row=x, column=y, padx=padx_main_frame, pady=pady_main_frame,
-                                                            sticky=MAIN_FRAMES_STICKY)
+    def grid_panel(self, frame_manager, row: int, title_columnspan: int) -> None:
+        """Grid layout of one panel, in place of its placeholder."""
+        frame_manager.master_frame.grid(row=row, column=0, padx=PANEL_PADX, pady=PANEL_PADY,
+                                        sticky=MAIN_FRAMES_STICKY)
         # bin panel have 5 buttons per row
-        self.binary_manager.frame_manager.title_frame.grid(row=0, column=0, columnspan=5, padx=5, pady=5,
-                                                           sticky=TITLE_FRAMES_STICKY)
-
-        self.blocknet_manager.frame_manager.master_frame.grid(row=x + 1, column=y, padx=padx_main_frame,
-                                                              pady=pady_main_frame,
-                                                              sticky=MAIN_FRAMES_STICKY)
-        self.blocknet_manager.frame_manager.title_frame.grid(row=0, column=0, columnspan=2, padx=5, pady=5,
-                                                             sticky=TITLE_FRAMES_STICKY)
-
-        self.blockdx_manager.frame_manager.master_frame.grid(row=x + 2, column=y, padx=padx_main_frame,
-                                                             pady=pady_main_frame,
-                                                             sticky=MAIN_FRAMES_STICKY)
-        self.blockdx_manager.frame_manager.title_frame.grid(row=0, column=0, columnspan=2, padx=5, pady=5,
-                                                            sticky=TITLE_FRAMES_STICKY)
-
-        self.xlite_manager.frame_manager.master_frame.grid(row=x + 3, column=y, padx=padx_main_frame,
-                                                           pady=pady_main_frame,
-                                                           sticky=MAIN_FRAMES_STICKY)
-        self.xlite_manager.frame_manager.title_frame.grid(row=0, column=0, columnspan=2, padx=5, pady=5,
-                                                          sticky=TITLE_FRAMES_STICKY)
+        frame_manager.title_frame.grid(row=0, column=0, columnspan=title_columnspan, padx=5, pady=5,
+                                       sticky=TITLE_FRAMES_STICKY)
+        frame_manager.grid_widgets(0, 0)
 
     def handle_signal(self, signum: int, frame) -> None:
         """Handle signals like SIGINT and SIGTERM."""
@@ -241,6 +341,9 @@ class Blocknet_AIO_GUI(ctk.CTk):
     def on_close(self) -> None:
         """Handle application close event."""
         logging.info("Closing application...")
+        self.process_sampler.stop()
+        self.health_scheduler.stop()
+        rpc_transport.shutdown()
         utils.terminate_all_threads()
         logging.info("Threads terminated.")
         os._exit(0)
@@ -267,24 +370,87 @@ class Blocknet_AIO_GUI(ctk.CTk):
         utils.save_cfg_json("theme", new_theme)
 
     def check_processes(self) -> None:
-        blocknet_processes, blockdx_processes, xlite_processes, xlite_daemon_processes = utils.processes_check()
+        """Apply the latest process snapshot published by the background sampler."""
+        snapshot = self.process_sampler.snapshot
+        if snapshot.timestamp != self.last_process_snapshot_timestamp:
+            self.last_process_snapshot_timestamp = snapshot.timestamp
+            self.apply_process_snapshot(snapshot)
+        self.after(1000, func=self.check_processes)
+
+    def apply_process_snapshot(self, snapshot: ProcessSnapshot) -> None:
+        # xlite-daemon is not launched by us, a crash shows up as the daemon vanishing while XLite still runs
+        if self.xlite_manager.daemon_process_running and not snapshot.xlite_daemon and snapshot.xlite:
+            self.restart_supervisor.on_exit("xlite_daemon")
+
+        self.update_health_probes(snapshot)
+
         # Update Blocknet process status and store the PIDs
-        self.blocknet_manager.blocknet_process_running = bool(blocknet_processes)
-        self.blocknet_manager.utility.blocknet_pids = blocknet_processes
+        self.blocknet_manager.blocknet_process_running = bool(snapshot.blocknet)
+        self.blocknet_manager.utility.blocknet_pids = list(snapshot.blocknet)
 
         # Update Block DX process status and store the PIDs
-        self.blockdx_manager.process_running = bool(blockdx_processes)
-        self.blockdx_manager.utility.blockdx_pids = blockdx_processes
+        self.blockdx_manager.process_running = bool(snapshot.blockdx)
+        self.blockdx_manager.utility.blockdx_pids = list(snapshot.blockdx)
 
         # Update Xlite process status and store the PIDs
-        self.xlite_manager.process_running = bool(xlite_processes)
-        self.xlite_manager.utility.xlite_pids = xlite_processes
+        self.xlite_manager.process_running = bool(snapshot.xlite)
+        self.xlite_manager.utility.xlite_pids = list(snapshot.xlite)
 
         # Update Xlite-daemon process status and store the PIDs
-        self.xlite_manager.daemon_process_running = bool(xlite_daemon_processes)
-        self.xlite_manager.utility.xlite_daemon_pids = xlite_daemon_processes
-
-        self.after(5000, func=self.check_processes)
+        self.xlite_manager.daemon_process_running = bool(snapshot.xlite_daemon)
+        self.xlite_manager.utility.xlite_daemon_pids = list(snapshot.xlite_daemon)
+
+    def update_health_probes(self, snapshot: ProcessSnapshot) -> None:
+        """Poll fast once a process shows up, and reset the probe state right away once it is gone."""
+        for running, new_running, probes in (
+                (self.blocknet_manager.blocknet_process_running, bool(snapshot.blocknet), ("blocknet_rpc",)),
+                (self.xlite_manager.daemon_process_running, bool(snapshot.xlite_daemon),
+                 ("xlite_daemon_confs", "xlite_coins_rpc"))):
+            if new_running == running:
+                continue
+            for probe in probes:
+                if new_running:
+                    self.health_scheduler.boost(probe)
+                else:
+                    self.health_scheduler.poke(probe)
+
+    def on_child_started(self, name: str, pid: int) -> None:
+        """Track a process launched by the monitor without waiting for a full scan."""
+        self.process_registry.adopt(pid)
+        self.process_sampler.request_sample()
+        if name == "blocknet":
+            self.health_scheduler.boost("blocknet_rpc")
+        elif name == "xlite":
+            # xlite-daemon is spawned by XLite, its confs and RPC show up shortly after
+            self.health_scheduler.boost("xlite_daemon_confs")
+            self.health_scheduler.boost("xlite_coins_rpc")
+
+    def on_child_exit(self, name: str, pid: int, returncode: int) -> None:
+        """Called from the waiter thread as soon as a process launched by the monitor exits."""
+        self.process_registry.forget(pid)
+        self.restart_supervisor.on_exit(name, returncode)
+        self.after(0, self.apply_child_exit, name, pid)
+        self.process_sampler.request_sample()
+
+    def apply_child_exit(self, name: str, pid: int) -> None:
+        """Flip the process state of the exited child right away, without waiting for the next sample."""
+        if name == "blocknet":
+            pids = [p for p in self.blocknet_manager.utility.blocknet_pids if p != pid]
+            self.blocknet_manager.utility.blocknet_pids = pids
+            self.blocknet_manager.blocknet_process_running = bool(pids)
+            self.health_scheduler.poke("blocknet_rpc")
+        elif name == "blockdx":
+            pids = [p for p in self.blockdx_manager.utility.blockdx_pids if p != pid]
+            self.blockdx_manager.utility.blockdx_pids = pids
+            self.blockdx_manager.process_running = bool(pids)
+        elif name == "xlite":
+            pids = [p for p in self.xlite_manager.utility.xlite_pids if p != pid]
+            self.xlite_manager.utility.xlite_pids = pids
+            self.xlite_manager.process_running = bool(pids)
+        elif name == "bots":
+            bot_manager = self.binary_manager.frame_manager.xbridge_bot_manager
+            if bot_manager.process and bot_manager.process.pid == pid:
+                bot_manager.process = None
 
 
 def run_gui() -> None:
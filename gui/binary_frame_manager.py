@@ -51,7 +51,7 @@ class BinaryFrameManager:
                                                           state='disabled',
                                                           width=option_menu_width)
         self.bots_version_optionmenu = ctk.CTkOptionMenu(self.master_frame,
-                                                         values=self.xbridge_bot_manager.get_available_branches(),
+                                                         values=[self.xbridge_bot_manager.current_branch],
                                                          state='normal',
                                                          width=option_menu_width)
         # Checkboxes BoolVars
@@ -10,6 +10,7 @@ from watchdog.observers import Observer
 import widgets_strings
 from gui.binary_frame_manager import BinaryFrameManager
 from utilities import utils, global_variables
+from utilities.download_manager import download_manager, format_download_status, format_download_telemetry
 
 
 class BinaryFileHandler(FileSystemEventHandler):
@@ -72,19 +73,21 @@ class BinaryManager:
         self.disable_start_xlite_button = False
         self.disable_start_blockdx_button = False
 
-        self.download_blocknet_thread = None
-        self.download_blockdx_thread = None
-        self.download_xlite_thread = None
+        self.download_blocknet_job = None
+        self.download_blockdx_job = None
+        self.download_xlite_job = None
 
         self.observer = Observer()
         self.handler = BinaryFileHandler(self)
         self.observer.schedule(self.handler, global_variables.aio_folder, recursive=False)
-        self.observer.start()
 
         self.tooltip_manager = self.root_gui.tooltip_manager
 
-    async def setup(self):
+    def setup(self):
         self.frame_manager = BinaryFrameManager(self)
+        # the handler updates the frame, only watch once it exists
+        self.observer.start()
+        self.update_xbridge_bots_version_optionmenu()
 
         self.root_gui.after(0, self.check_and_update_aio_folder)
         self.root_gui.after(0, self.update_blocknet_buttons)
@@ -92,31 +95,51 @@ class BinaryManager:
         self.root_gui.after(0, self.update_xlite_buttons)
         self.root_gui.after(0, self.update_xbridge_bots_buttons)  # Add this line
 
-    def _start_or_close_binary(self, process_running, stop_func, start_func, button, disable_flag):
+    def _start_or_close_binary(self, process_running, stop_func, start_func, button, disable_flag,
+                               rescan_after_start=False):
         img = self.root_gui.stop_greyed_img if process_running else self.root_gui.start_greyed_img
         utils.disable_button(button, img=img)
         setattr(self, disable_flag,
                 True)  # Disable the button flag
         if process_running:
             Thread(target=stop_func).start()
+            self.root_gui.after(self.root_gui.time_disable_button, self._enable_binary_start_button, disable_flag)
         else:
-            Thread(target=start_func).start()
-        self.root_gui.after(self.root_gui.time_disable_button, self._enable_binary_start_button, disable_flag)
+            Thread(target=self._start_binary, args=(start_func, rescan_after_start, disable_flag)).start()
+
+    def _start_binary(self, start_func, rescan_after_start, disable_flag):
+        # processes we launch are adopted by the registry through child_exit_watcher, only processes
+        # spawned by the app itself (xlite-daemon) need full scans to be found
+        try:
+            start_func()
+            if rescan_after_start:
+                self.root_gui.process_registry.request_rescan(window=30)
+                self.root_gui.process_sampler.request_sample()
+        finally:
+            # the start may wait for the conf checks, the button stays disabled until it returned
+            self.root_gui.after(self.root_gui.time_disable_button, self._enable_binary_start_button, disable_flag)
 
     def _enable_binary_start_button(self, disable_flag):
         setattr(self, disable_flag, False)
 
     def start_or_close_blocknet(self):
         if not self.root_gui.blocknet_manager.blocknet_process_running:
-            self.root_gui.blocknet_manager.check_config()
+            self.root_gui.restart_supervisor.manual_start("blocknet")
+        else:
+            self.root_gui.restart_supervisor.expect_exit("blocknet")
         self._start_or_close_binary(
             process_running=self.root_gui.blocknet_manager.blocknet_process_running,
             stop_func=self.root_gui.blocknet_manager.utility.close_blocknet,
-            start_func=self.root_gui.blocknet_manager.utility.start_blocknet,
+            start_func=self.start_blocknet_with_config,
             button=self.frame_manager.blocknet_start_close_button,
             disable_flag='disable_start_blocknet_button'
         )
 
+    def start_blocknet_with_config(self):
+        # runs on the start thread, the conf check may wait for the remote confs refresh
+        self.root_gui.blocknet_manager.check_config()
+        self.root_gui.blocknet_manager.utility.start_blocknet()
+
     def start_or_close_blockdx(self):
         if not self.root_gui.blockdx_manager.process_running:
             self.root_gui.blockdx_manager.blockdx_check_config()
@@ -128,18 +151,30 @@ class BinaryManager:
             disable_flag='disable_start_blockdx_button'
         )
 
+    def xlite_env_vars(self):
+        if self.root_gui.stored_password:
+            return [{"CC_WALLET_PASS": self.root_gui.stored_password}, {"CC_WALLET_AUTOLOGIN": 'true'}]
+        return []
+
+    def restart_xlite(self):
+        self.root_gui.xlite_manager.utility.close_xlite()
+        self.root_gui.xlite_manager.utility.start_xlite(env_vars=self.xlite_env_vars())
+
     def start_or_close_xlite(self):
-        if not self.root_gui.xlite_manager.process_running and self.root_gui.stored_password:
-            env_vars = [{"CC_WALLET_PASS": self.root_gui.stored_password}, {"CC_WALLET_AUTOLOGIN": 'true'}]
+        if not self.root_gui.xlite_manager.process_running:
+            env_vars = self.xlite_env_vars()
+            self.root_gui.restart_supervisor.manual_start("xlite_daemon")
         else:
             env_vars = []
+            self.root_gui.restart_supervisor.expect_exit("xlite_daemon")
 
         self._start_or_close_binary(
             process_running=self.root_gui.xlite_manager.process_running,
             stop_func=self.root_gui.xlite_manager.utility.close_xlite,
             start_func=lambda: self.root_gui.xlite_manager.utility.start_xlite(env_vars=env_vars),
             button=self.frame_manager.xlite_toggle_execution_button,
-            disable_flag='disable_start_xlite_button'
+            disable_flag='disable_start_xlite_button',
+            rescan_after_start=True
         )
 
     def install_delete_blocknet_command(self):
@@ -151,9 +186,10 @@ class BinaryManager:
 
     def download_blocknet_command(self):
         utils.disable_button(self.frame_manager.install_delete_blocknet_button, img=self.root_gui.install_greyed_img)
-        self.download_blocknet_thread = Thread(target=self.root_gui.blocknet_manager.utility.download_blocknet_bin,
-                                               daemon=True)
-        self.download_blocknet_thread.start()
+        utility = self.root_gui.blocknet_manager.utility
+        utility.downloading_bin = True  # until the job leaves the download queue
+        self.download_blocknet_job = download_manager.submit("blocknet", utility.download_blocknet_bin,
+                                                             global_variables.blocknet_release_url)
 
     def delete_blocknet_command(self):
         blocknet_pruned_version = self.root_gui.blocknet_manager.version[0].replace('v', '')
@@ -175,9 +211,10 @@ class BinaryManager:
 
     def download_blockdx_command(self):
         utils.disable_button(self.frame_manager.install_delete_blockdx_button, img=self.root_gui.install_greyed_img)
-        self.download_blockdx_thread = Thread(target=self.root_gui.blockdx_manager.utility.download_blockdx_bin,
-                                              daemon=True)
-        self.download_blockdx_thread.start()
+        utility = self.root_gui.blockdx_manager.utility
+        utility.downloading_bin = True  # until the job leaves the download queue
+        self.download_blockdx_job = download_manager.submit("blockdx", utility.download_blockdx_bin,
+                                                            global_variables.blockdx_release_url)
 
     def delete_blockdx_command(self):
         blockdx_pruned_version = self.root_gui.blockdx_manager.version[0].replace('v', '')
@@ -205,8 +242,10 @@ class BinaryManager:
 
     def download_xlite_command(self):
         utils.disable_button(self.frame_manager.install_delete_xlite_button, img=self.root_gui.install_greyed_img)
-        self.download_xlite_thread = Thread(target=self.root_gui.xlite_manager.utility.download_xlite_bin, daemon=True)
-        self.download_xlite_thread.start()
+        utility = self.root_gui.xlite_manager.utility
+        utility.downloading_bin = True  # until the job leaves the download queue
+        self.download_xlite_job = download_manager.submit("xlite", utility.download_xlite_bin,
+                                                          global_variables.xlite_release_url)
 
     def delete_xlite_command(self):
         xlite_pruned_version = self.root_gui.xlite_manager.version[0].replace('v', '')
@@ -304,9 +343,8 @@ class BinaryManager:
         # BLOCKNET
         self.update_blocknet_start_close_button()
         blocknet_boolvar = self.frame_manager.blocknet_installed_boolvar.get()
-        percent_buff = self.root_gui.blocknet_manager.utility.binary_percent_download
-        dl_string = f"{int(percent_buff)}%" if percent_buff else ""
-        var_blocknet = dl_string if self.root_gui.blocknet_manager.utility.downloading_bin else ""
+        download_job = download_manager.get("blocknet")
+        var_blocknet = format_download_status(download_job)
         blocknet_folder = os.path.join(global_variables.aio_folder, global_variables.conf_data.blocknet_bin_path[0])
         if blocknet_boolvar:
             var_blocknet = ""
@@ -314,8 +352,10 @@ class BinaryManager:
                                                 msg=blocknet_folder)
             button_condition = self.root_gui.blocknet_manager.blocknet_process_running or self.root_gui.blocknet_manager.utility.downloading_bin
         else:
+            telemetry = format_download_telemetry(download_job)
             self.tooltip_manager.update_tooltip(widget=self.frame_manager.install_delete_blocknet_button,
-                                                msg=global_variables.blocknet_release_url)
+                                                msg=f"{global_variables.blocknet_release_url}\n{telemetry}" if telemetry
+                                                else global_variables.blocknet_release_url)
             button_condition = self.root_gui.blocknet_manager.utility.downloading_bin
 
         if button_condition:
@@ -331,9 +371,8 @@ class BinaryManager:
         # BLOCK-DX
         self.update_blockdx_start_close_button()
         blockdx_boolvar = self.frame_manager.blockdx_installed_boolvar.get()
-        percent_buff = self.root_gui.blockdx_manager.utility.binary_percent_download
-        dl_string = f"{int(percent_buff)}%" if percent_buff else ""
-        var_blockdx = dl_string if self.root_gui.blockdx_manager.utility.downloading_bin else ""
+        download_job = download_manager.get("blockdx")
+        var_blockdx = format_download_status(download_job)
         blockdx_folder = os.path.join(global_variables.aio_folder, global_variables.blockdx_curpath)
         if blockdx_boolvar:
             var_blockdx = ""
@@ -341,8 +380,10 @@ class BinaryManager:
                                                 msg=blockdx_folder)
             button_condition = self.root_gui.blockdx_manager.process_running or self.root_gui.blockdx_manager.utility.downloading_bin
         else:
+            telemetry = format_download_telemetry(download_job)
             self.tooltip_manager.update_tooltip(widget=self.frame_manager.install_delete_blockdx_button,
-                                                msg=global_variables.blockdx_release_url)
+                                                msg=f"{global_variables.blockdx_release_url}\n{telemetry}" if telemetry
+                                                else global_variables.blockdx_release_url)
             button_condition = self.root_gui.blockdx_manager.utility.downloading_bin
 
         if button_condition:
@@ -359,9 +400,8 @@ class BinaryManager:
         # Xlite
         self.update_xlite_start_close_button()
         xlite_boolvar = self.frame_manager.xlite_installed_boolvar.get()
-        percent_buff = self.root_gui.xlite_manager.utility.binary_percent_download
-        dl_string = f"{int(percent_buff)}%" if percent_buff else ""
-        var_xlite = dl_string if self.root_gui.xlite_manager.utility.downloading_bin else ""
+        download_job = download_manager.get("xlite")
+        var_xlite = format_download_status(download_job)
         folder = os.path.join(global_variables.aio_folder, global_variables.xlite_curpath)
         if xlite_boolvar:
             var_xlite = ""
@@ -369,8 +409,10 @@ class BinaryManager:
                                                 msg=folder)
             button_condition = self.root_gui.xlite_manager.process_running or self.root_gui.xlite_manager.utility.downloading_bin
         else:
+            telemetry = format_download_telemetry(download_job)
             self.tooltip_manager.update_tooltip(widget=self.frame_manager.install_delete_xlite_button,
-                                                msg=global_variables.xlite_release_url)
+                                                msg=f"{global_variables.xlite_release_url}\n{telemetry}" if telemetry
+                                                else global_variables.xlite_release_url)
             button_condition = self.root_gui.xlite_manager.utility.downloading_bin
 
         if button_condition:
@@ -509,5 +551,9 @@ class BinaryManager:
             utils.disable_button(self.frame_manager.bots_toggle_execution_button, img=img)
 
     def update_xbridge_bots_version_optionmenu(self):
-        self.frame_manager.bots_version_optionmenu.configure(
-            values=self.frame_manager.xbridge_bot_manager.get_available_branches())
+        """The branches are fetched from GitHub off the Tk thread, the menu shows the current branch until then."""
+        Thread(target=self._fetch_xbridge_bots_branches, name="XBridgeBotsBranches", daemon=True).start()
+
+    def _fetch_xbridge_bots_branches(self):
+        branches = self.frame_manager.xbridge_bot_manager.get_available_branches()
+        self.root_gui.after(0, lambda: self.frame_manager.bots_version_optionmenu.configure(values=branches))
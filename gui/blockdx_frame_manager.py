@@ -7,6 +7,7 @@ import widgets_strings
 from gui.constants import PANEL_CHECKBOXES_WIDTH, HEADER_FRAMES_STICKY, CORNER_RADIUS, CHECK_BOXES_STICKY, \
     BLOCKDX_FRAME_WIDTH
 from utilities import global_variables
+from utilities.process_telemetry import format_telemetry, format_orphans
 
 
 class BlockDxFrameManager:
@@ -40,11 +41,17 @@ class BlockDxFrameManager:
                                                                 state='disabled',
                                                                 width=PANEL_CHECKBOXES_WIDTH)  # , disabledforeground='black')
 
+        self.telemetry_label_string_var = ctk.StringVar(value='')
+        self.telemetry_label = ctk.CTkLabel(self.master_frame,
+                                            textvariable=self.telemetry_label_string_var,
+                                            anchor=HEADER_FRAMES_STICKY)
+
     def grid_widgets(self, x, y):
         # block-dx
         self.label.grid(row=x, column=y, padx=5, pady=5)
         self.process_status_checkbox.grid(row=x + 1, column=y, padx=5, pady=5, sticky=CHECK_BOXES_STICKY)
         self.valid_config_checkbox.grid(row=x + 1, column=y + 1, padx=5, pady=5, sticky=CHECK_BOXES_STICKY)
+        self.telemetry_label.grid(row=x + 2, column=y, columnspan=2, padx=5, sticky="w")
 
     def update_blockdx_process_status_checkbox(self):
         # blockdx_process_status_checkbox_state
@@ -54,6 +61,12 @@ class BlockDxFrameManager:
         var = widgets_strings.blockdx_running_string if self.parent.process_running else widgets_strings.blockdx_not_running_string
         self.process_status_checkbox_string_var.set(var)
 
+    def update_blockdx_telemetry_label(self):
+        stats = self.root_gui.process_telemetry.latest.get('blockdx')
+        orphans = self.root_gui.process_telemetry.orphans.get('blockdx')
+        lines = [format_telemetry(stats), format_orphans(orphans, prefix="Block-DX: ")]
+        self.telemetry_label_string_var.set("\n".join(line for line in lines if line))
+
     def update_blockdx_config_button_checkbox(self):
         # blockdx_valid_config_checkbox_state
         # blockdx_check_config_button
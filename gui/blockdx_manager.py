@@ -15,7 +15,7 @@ class BlockDXManager:
         self.process_running = False
         self.is_config_sync = None
 
-    async def setup(self):
+    def setup(self):
         self.frame_manager = BlockDxFrameManager(self)
         self.root_gui.after(0, self.update_status_blockdx)
 
@@ -33,4 +33,5 @@ class BlockDXManager:
     def update_status_blockdx(self):
         self.frame_manager.update_blockdx_process_status_checkbox()
         self.frame_manager.update_blockdx_config_button_checkbox()
+        self.frame_manager.update_blockdx_telemetry_label()
         self.root_gui.after(2000, self.update_status_blockdx)
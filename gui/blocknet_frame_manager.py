@@ -1,5 +1,4 @@
 import os
-from threading import Thread
 
 import customtkinter as ctk
 
@@ -8,6 +7,11 @@ import widgets_strings
 from gui.constants import BUTTON_WIDTH, PANEL_CHECKBOXES_WIDTH, HEADER_FRAMES_STICKY, CORNER_RADIUS, \
     CHECK_BOXES_STICKY, BLOCKNET_DATADIR_INPUT_WIDTH
 from utilities import utils, global_variables
+from utilities.download_manager import PRIORITY_LOW, download_manager, format_download_telemetry
+from utilities.process_supervisor import format_supervisor_status
+from utilities.process_telemetry import format_telemetry
+from utilities.sync_util import format_sync_progress
+from utilities.zmq_util import format_chain_tip
 
 
 class BlocknetCoreFrameManager:
@@ -81,6 +85,40 @@ class BlocknetCoreFrameManager:
                                                                   state='disabled',
                                                                   width=PANEL_CHECKBOXES_WIDTH)  # , disabledforeground='black')
 
+        self.telemetry_label_string_var = ctk.StringVar(value='')
+        self.telemetry_label = ctk.CTkLabel(self.master_frame,
+                                            textvariable=self.telemetry_label_string_var,
+                                            anchor=HEADER_FRAMES_STICKY)
+
+        self.auto_restart_checkbox_state = ctk.BooleanVar(
+            value=self.root_gui.restart_supervisor.status('blocknet').enabled)
+        self.auto_restart_checkbox = ctk.CTkCheckBox(self.master_frame,
+                                                     text=widgets_strings.auto_restart_blocknet_string,
+                                                     variable=self.auto_restart_checkbox_state,
+                                                     command=self.auto_restart_command,
+                                                     corner_radius=CORNER_RADIUS,
+                                                     width=PANEL_CHECKBOXES_WIDTH)
+        self.supervisor_label_string_var = ctk.StringVar(value='')
+        self.supervisor_label = ctk.CTkLabel(self.master_frame,
+                                             textvariable=self.supervisor_label_string_var,
+                                             anchor=HEADER_FRAMES_STICKY)
+
+        self.zmq_checkbox_state = ctk.BooleanVar(value=self.parent.utility.zmq_notifications)
+        self.zmq_checkbox = ctk.CTkCheckBox(self.master_frame,
+                                            text=widgets_strings.zmq_notifications_string,
+                                            variable=self.zmq_checkbox_state,
+                                            command=self.zmq_notifications_command,
+                                            corner_radius=CORNER_RADIUS,
+                                            width=PANEL_CHECKBOXES_WIDTH)
+        self.chain_label_string_var = ctk.StringVar(value='')
+        self.chain_label = ctk.CTkLabel(self.master_frame,
+                                        textvariable=self.chain_label_string_var,
+                                        anchor=HEADER_FRAMES_STICKY)
+        self.sync_label_string_var = ctk.StringVar(value='')
+        self.sync_label = ctk.CTkLabel(self.master_frame,
+                                       textvariable=self.sync_label_string_var,
+                                       anchor=HEADER_FRAMES_STICKY)
+
     def grid_widgets(self, x, y):
         # Grid all widgets in this frame
         self.label.grid(row=x, column=y, columnspan=2, padx=5, pady=5, sticky="w")
@@ -92,6 +130,12 @@ class BlocknetCoreFrameManager:
         self.process_status_checkbox.grid(row=x + 3, column=y, padx=5, pady=5, sticky=CHECK_BOXES_STICKY)
         self.conf_status_checkbox.grid(row=x + 2, column=y + 1, padx=5, pady=5, sticky=CHECK_BOXES_STICKY)
         self.rpc_connection_checkbox.grid(row=x + 3, column=y + 1, padx=5, pady=5, sticky=CHECK_BOXES_STICKY)
+        self.telemetry_label.grid(row=x + 4, column=y, columnspan=2, padx=5, sticky="w")
+        self.auto_restart_checkbox.grid(row=x + 5, column=y, padx=5, pady=5, sticky=CHECK_BOXES_STICKY)
+        self.supervisor_label.grid(row=x + 5, column=y + 1, padx=5, pady=5, sticky="w")
+        self.zmq_checkbox.grid(row=x + 6, column=y, padx=5, pady=5, sticky=CHECK_BOXES_STICKY)
+        self.chain_label.grid(row=x + 6, column=y + 1, padx=5, pady=5, sticky="w")
+        self.sync_label.grid(row=x + 7, column=y, columnspan=2, padx=5, sticky="w")
 
     def update_blocknet_bootstrap_button(self):
         bootstrap_download_in_progress = bool(self.parent.utility.bootstrap_checking)
@@ -101,16 +145,22 @@ class BlocknetCoreFrameManager:
             utils.enable_button(self.download_bootstrap_button, img=self.root_gui.install_img)
         else:
             utils.disable_button(self.download_bootstrap_button, img=self.root_gui.install_greyed_img)
+        download_job = download_manager.get("bootstrap")
         if bootstrap_download_in_progress:
-            if self.parent.utility.bootstrap_percent_download:
-                var = f"{self.parent.utility.bootstrap_percent_download:.1f}%"
-            elif self.parent.utility.bootstrap_extracting:
+            if self.parent.utility.bootstrap_extracting:
                 var = "Unpacking"
+            elif download_job and download_job.state == "queued":
+                var = "Queued"
+            elif download_job and download_job.percent() is not None:
+                var = f"{download_job.percent():.1f}%"
             else:
                 var = "Loading"
         else:
             var = "Bootstrap"
         self.download_bootstrap_string_var.set(var)
+        self.root_gui.tooltip_manager.update_tooltip(widget=self.download_bootstrap_button,
+                                                     msg=format_download_telemetry(download_job) or
+                                                     global_variables.conf_data.blocknet_bootstrap_url)
 
     def update_blocknet_process_status_checkbox(self):
         # blocknet_process_status_checkbox_string_var
@@ -156,6 +206,30 @@ class BlocknetCoreFrameManager:
         var = widgets_strings.blocknet_active_rpc_string if self.parent.utility.valid_rpc else widgets_strings.blocknet_inactive_rpc_string
         self.rpc_connection_checkbox_string_var.set(var)
 
+    def update_blocknet_telemetry_label(self):
+        stats = self.root_gui.process_telemetry.latest.get('blocknet')
+        self.telemetry_label_string_var.set(format_telemetry(stats))
+
+    def update_blocknet_supervisor_label(self):
+        service = self.root_gui.restart_supervisor.status('blocknet')
+        self.supervisor_label_string_var.set(format_supervisor_status(service))
+
+    def update_blocknet_chain_label(self):
+        self.chain_label_string_var.set(format_chain_tip(self.parent.utility.chain_tip))
+
+    def update_blocknet_sync_label(self):
+        self.sync_label_string_var.set(format_sync_progress(self.parent.utility.sync_progress))
+
+    def zmq_notifications_command(self):
+        enabled = self.zmq_checkbox_state.get()
+        self.parent.utility.set_zmq_notifications(enabled)
+        utils.save_cfg_json('zmq_notifications', enabled)
+
+    def auto_restart_command(self):
+        enabled = self.auto_restart_checkbox_state.get()
+        self.root_gui.restart_supervisor.set_enabled('blocknet', enabled)
+        utils.save_cfg_json('auto_restart_blocknet', enabled)
+
     def on_custom_path_set(self, custom_path):
         self.parent.utility.set_custom_data_path(custom_path)
         self.data_path_entry_string_var.set(self.parent.utility.data_folder)
@@ -204,5 +278,7 @@ class BlocknetCoreFrameManager:
 
     def download_bootstrap_command(self):
         utils.disable_button(self.download_bootstrap_button, img=self.root_gui.install_greyed_img)
-        self.parent.bootstrap_thread = Thread(target=self.parent.utility.download_bootstrap, daemon=True)
-        self.parent.bootstrap_thread.start()
+        self.parent.utility.bootstrap_checking = True  # until the job leaves the download queue
+        self.parent.bootstrap_job = download_manager.submit("bootstrap", self.parent.utility.download_bootstrap,
+                                                            global_variables.conf_data.blocknet_bootstrap_url,
+                                                            priority=PRIORITY_LOW)
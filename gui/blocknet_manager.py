@@ -10,12 +10,20 @@ class BlocknetManager:
         self.version = [global_variables.blocknet_release_url.split('/')[7]]
         self.blocknet_process_running = False
 
-        self.bootstrap_thread = None
+        self.bootstrap_job = None
 
-        self.utility = BlocknetUtility(custom_path=self.root_gui.custom_path)
+        zmq_notifications = bool(self.root_gui.cfg and self.root_gui.cfg.get('zmq_notifications'))
+        self.utility = BlocknetUtility(custom_path=self.root_gui.custom_path, zmq_notifications=zmq_notifications)
 
-    async def setup(self):
+    def setup(self):
         self.frame_manager = BlocknetCoreFrameManager(self)
+        # network and chain status in one batch, the chain part is dropped once synced with ZMQ live
+        self.root_gui.health_scheduler.register("blocknet_rpc", self.utility.probe_blocknet_rpc,
+                                                steady_interval=5, fast_interval=1, max_backoff=30,
+                                                target_running=lambda: self.blocknet_process_running,
+                                                on_down=self.utility.reset_blocknet_rpc_status)
+        if self.utility.zmq_notifications:
+            self.utility.start_zmq_listener()
 
         self.root_gui.after(0, self.update_status_blocknet_core)
 
@@ -34,4 +42,8 @@ class BlocknetManager:
         self.frame_manager.update_blocknet_conf_status_checkbox()
         self.frame_manager.update_blocknet_data_path_status_checkbox()
         self.frame_manager.update_blocknet_rpc_connection_checkbox()
+        self.frame_manager.update_blocknet_telemetry_label()
+        self.frame_manager.update_blocknet_supervisor_label()
+        self.frame_manager.update_blocknet_chain_label()
+        self.frame_manager.update_blocknet_sync_label()
         self.root_gui.after(2000, self.update_status_blocknet_core)
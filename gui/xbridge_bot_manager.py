@@ -7,6 +7,7 @@ from datetime import datetime
 
 from utilities.git_repo_management import GitRepoManagement
 from utilities.global_variables import aio_folder
+from utilities.process_supervisor import child_exit_watcher
 
 
 class XBridgeBotManager:
@@ -175,6 +176,7 @@ class XBridgeBotManager:
                 logging.info(f"Attempting to run script gui_pingpong.py in {self.target_dir}")
                 self.process = self.repo_management.run_script("gui_pingpong.py")
                 if self.process:
+                    child_exit_watcher.watch("bots", self.process)
                     logging.info(f"Script started with PID: {self.process.pid}")
                 else:
                     logging.error("Failed to start script - no process returned")
@@ -9,6 +9,8 @@ from custom_tk_mods import ctkInputDialogMod
 from gui.constants import BUTTON_WIDTH, PANEL_CHECKBOXES_WIDTH, CORNER_RADIUS, HEADER_FRAMES_STICKY, \
     CHECK_BOXES_STICKY, XLITE_FRAME_WIDTH
 from utilities import utils
+from utilities.process_supervisor import format_supervisor_status
+from utilities.process_telemetry import format_telemetry, format_orphans
 
 
 class XliteFrameManager:
@@ -68,6 +70,28 @@ class XliteFrameManager:
                                                                        state='disabled',
                                                                        width=PANEL_CHECKBOXES_WIDTH)
 
+        self.telemetry_label_string_var = ctk.StringVar(value='')
+        self.telemetry_label = ctk.CTkLabel(self.master_frame,
+                                            textvariable=self.telemetry_label_string_var,
+                                            anchor=HEADER_FRAMES_STICKY)
+        self.daemon_telemetry_label_string_var = ctk.StringVar(value='')
+        self.daemon_telemetry_label = ctk.CTkLabel(self.master_frame,
+                                                   textvariable=self.daemon_telemetry_label_string_var,
+                                                   anchor=HEADER_FRAMES_STICKY)
+
+        self.auto_restart_checkbox_state = ctk.BooleanVar(
+            value=self.root_gui.restart_supervisor.status('xlite_daemon').enabled)
+        self.auto_restart_checkbox = ctk.CTkCheckBox(self.master_frame,
+                                                     text=widgets_strings.auto_restart_xlite_daemon_string,
+                                                     variable=self.auto_restart_checkbox_state,
+                                                     command=self.auto_restart_command,
+                                                     corner_radius=CORNER_RADIUS,
+                                                     width=PANEL_CHECKBOXES_WIDTH)
+        self.supervisor_label_string_var = ctk.StringVar(value='')
+        self.supervisor_label = ctk.CTkLabel(self.master_frame,
+                                             textvariable=self.supervisor_label_string_var,
+                                             anchor=HEADER_FRAMES_STICKY)
+
         # Create the Button widget with a text variable
         self.store_password_button_string_var = ctk.StringVar(value='')
         self.store_password_button = ctk.CTkButton(self.title_frame,
@@ -134,6 +158,10 @@ class XliteFrameManager:
         self.valid_config_checkbox.grid(row=x + 1, column=y + 1, padx=5, pady=5, sticky=CHECK_BOXES_STICKY)
         self.daemon_valid_config_checkbox.grid(row=x + 2, column=y + 1, padx=5, pady=5, sticky=CHECK_BOXES_STICKY)
         self.store_password_button.grid(row=x, column=y + 3, padx=2, pady=2, sticky="e")
+        self.telemetry_label.grid(row=x + 3, column=y, columnspan=2, padx=5, sticky="w")
+        self.daemon_telemetry_label.grid(row=x + 4, column=y, columnspan=2, padx=5, sticky="w")
+        self.auto_restart_checkbox.grid(row=x + 5, column=y, padx=5, pady=5, sticky=CHECK_BOXES_STICKY)
+        self.supervisor_label.grid(row=x + 5, column=y + 1, padx=5, pady=5, sticky="w")
 
     def update_xlite_process_status_checkbox(self):
         # xlite_process_status_checkbox_state
@@ -156,6 +184,23 @@ class XliteFrameManager:
         var = widgets_strings.xlite_daemon_running_string if self.parent.daemon_process_running else widgets_strings.xlite_daemon_not_running_string
         self.daemon_process_status_checkbox_string_var.set(var)
 
+    def update_xlite_telemetry_labels(self):
+        stats = self.root_gui.process_telemetry.latest.get('xlite')
+        orphans = self.root_gui.process_telemetry.orphans.get('xlite')
+        lines = [format_telemetry(stats, prefix="XLite: "), format_orphans(orphans, prefix="XLite: ")]
+        self.telemetry_label_string_var.set("\n".join(line for line in lines if line))
+        daemon_stats = self.root_gui.process_telemetry.latest.get('xlite_daemon')
+        self.daemon_telemetry_label_string_var.set(format_telemetry(daemon_stats, prefix="Daemon: "))
+
+    def update_xlite_supervisor_label(self):
+        service = self.root_gui.restart_supervisor.status('xlite_daemon')
+        self.supervisor_label_string_var.set(format_supervisor_status(service))
+
+    def auto_restart_command(self):
+        enabled = self.auto_restart_checkbox_state.get()
+        self.root_gui.restart_supervisor.set_enabled('xlite_daemon', enabled)
+        utils.save_cfg_json('auto_restart_xlite_daemon', enabled)
+
     def update_xlite_valid_config_checkbox(self):
         # xlite_valid_config_checkbox_state
         valid_config = True if self.parent.utility.xlite_conf_local else False
@@ -1,4 +1,5 @@
 import logging
+from threading import Thread
 
 from gui.xlite_frame_manager import XliteFrameManager
 from utilities import global_variables
@@ -15,9 +16,16 @@ class XliteManager:
         self.version = [global_variables.xlite_release_url.split('/')[7]]
         self.process_running = False
         self.daemon_process_running = False
+        self.xbridge_conf_thread = None
 
-    async def setup(self):
+    def setup(self):
         self.frame_manager = XliteFrameManager(self)
+        self.root_gui.health_scheduler.register("xlite_daemon_confs", self.utility.probe_xlite_daemon_confs,
+                                                steady_interval=30, fast_interval=2, max_backoff=60)
+        self.root_gui.health_scheduler.register("xlite_coins_rpc", self.utility.probe_xlite_coins_rpc,
+                                                steady_interval=15, fast_interval=1, max_backoff=30,
+                                                target_running=lambda: self.daemon_process_running,
+                                                on_down=self.utility.reset_xlite_coins_rpc_status)
         self.root_gui.after(0, self.update_status_xlite)
 
     def refresh_xlite_confs(self):
@@ -25,15 +33,27 @@ class XliteManager:
         self.utility.parse_xlite_daemon_conf()
 
     def detect_new_xlite_install_and_add_to_xbridge(self):
-        if not self.root_gui.disable_daemons_conf_check and self.utility.valid_coins_rpc:
-            self.root_gui.blocknet_manager.utility.check_xbridge_conf(self.utility.xlite_daemon_confs_local)
-            if self.root_gui.blocknet_manager.blocknet_process_running and self.root_gui.blocknet_manager.utility.valid_rpc:
-                logging.debug("dxloadxbridgeConf")
-                self.root_gui.blocknet_manager.utility.blocknet_rpc.send_rpc_request("dxloadxbridgeConf")
+        # runs on the GUI thread, the conf check fetches remote confs and is handed to a worker thread
+        if (not self.root_gui.disable_daemons_conf_check and self.utility.valid_coins_rpc and
+                self.root_gui.blocknet_manager.utility.remote_confs_ready.is_set() and
+                not (self.xbridge_conf_thread and self.xbridge_conf_thread.is_alive())):
             self.root_gui.disable_daemons_conf_check = True
+            self.xbridge_conf_thread = Thread(target=self.add_xlite_coins_to_xbridge, name="XliteXBridgeConf",
+                                              daemon=True)
+            self.xbridge_conf_thread.start()
         if self.root_gui.disable_daemons_conf_check and not self.utility.valid_coins_rpc:
             self.root_gui.disable_daemons_conf_check = False
 
+    def add_xlite_coins_to_xbridge(self):
+        blocknet_utility = self.root_gui.blocknet_manager.utility
+        try:
+            blocknet_utility.check_xbridge_conf(self.utility.xlite_daemon_confs_local)
+            if self.root_gui.blocknet_manager.blocknet_process_running and blocknet_utility.valid_rpc:
+                logging.debug("dxloadxbridgeConf")
+                blocknet_utility.blocknet_rpc.send_rpc_request("dxloadxbridgeConf")
+        except Exception as e:
+            logging.error(f"Error adding XLite coins to xbridge.conf: {e}")
+
     def update_status_xlite(self):
         self.detect_new_xlite_install_and_add_to_xbridge()
         self.frame_manager.update_xlite_process_status_checkbox()
@@ -41,4 +61,6 @@ class XliteManager:
         self.frame_manager.update_xlite_daemon_process_status()
         self.frame_manager.update_xlite_valid_config_checkbox()
         self.frame_manager.update_xlite_daemon_valid_config_checkbox()
+        self.frame_manager.update_xlite_telemetry_labels()
+        self.frame_manager.update_xlite_supervisor_label()
         self.root_gui.after(2000, self.update_status_xlite)
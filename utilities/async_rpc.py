@@ -0,0 +1,93 @@
+import asyncio
+import json
+import time
+from typing import NamedTuple
+
+from utilities.rpc_util import JSONRPCClient, rpc_timeout
+
+
+class RPCStatus(NamedTuple):
+    """Result of one asynchronous RPC probe."""
+    up: bool
+    latency: float = None
+    error: str = None
+
+
+async def async_rpc_call(client: JSONRPCClient, method: str, params=None, timeout: float = None):
+    """
+    Send one JSON-RPC call over a plain asyncio stream, raises on any failure or once the deadline is hit.
+    :param timeout: overall deadline in seconds, defaults to the method connect + read budget
+    """
+    if timeout is None:
+        timeout = sum(rpc_timeout(method))
+    return await asyncio.wait_for(_async_rpc_call(client, method, params), timeout)
+
+
+async def _async_rpc_call(client: JSONRPCClient, method: str, params=None):
+    host = "localhost"
+    body = json.dumps(client.build_request(method, params)).encode()
+    header_lines = [f"POST / HTTP/1.1", f"Host: {host}:{client.rpc_port}", f"Content-Length: {len(body)}",
+                    "Connection: close"]
+    header_lines += [f"{key}: {value}" for key, value in client.headers.items()]
+    reader, writer = await asyncio.open_connection(host, client.rpc_port)
+    try:
+        writer.write(("\r\n".join(header_lines) + "\r\n\r\n").encode() + body)
+        await writer.drain()
+        status_line = await reader.readline()
+        status = int(status_line.split()[1])
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            key, _, value = line.decode('latin-1').partition(':')
+            headers[key.strip().lower()] = value.strip()
+        payload = await _read_body(reader, headers)
+    finally:
+        writer.close()
+    if status != 200:
+        raise ConnectionError(f"HTTP {status}")
+    answer = json.loads(payload)
+    if answer.get('error'):
+        raise ConnectionError(f"RPC error: {answer['error']}")
+    return answer.get('result')
+
+
+async def _read_body(reader: asyncio.StreamReader, headers: dict) -> bytes:
+    """Body framed as announced in the headers: chunked, Content-Length, or up to EOF."""
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b';')[0].strip(), 16)
+            if size == 0:
+                # skip trailers
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                return b"".join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+    if 'content-length' in headers:
+        return await reader.readexactly(int(headers['content-length']))
+    return await reader.read()
+
+
+async def _probe(client: JSONRPCClient, method: str, timeout: float = None) -> RPCStatus:
+    start = time.perf_counter()
+    try:
+        await async_rpc_call(client, method, timeout=timeout)
+        return RPCStatus(up=True, latency=time.perf_counter() - start)
+    except asyncio.TimeoutError:
+        return RPCStatus(up=False, error=f"timeout after {timeout or sum(rpc_timeout(method))}s")
+    except Exception as e:
+        return RPCStatus(up=False, error=str(e) or type(e).__name__)
+
+
+async def probe_all(clients: dict, method: str = "getinfo", timeout: float = None) -> dict:
+    """Probe every client at once, total time is bounded by the slowest one. Returns {name: RPCStatus}."""
+    names = list(clients)
+    results = await asyncio.gather(*(_probe(clients[name], method, timeout) for name in names))
+    return dict(zip(names, results))
+
+
+def run_probe_all(clients: dict, method: str = "getinfo", timeout: float = None) -> dict:
+    """Blocking entry point for the health check threads."""
+    if not clients:
+        return {}
+    return asyncio.run(probe_all(clients, method, timeout))
@@ -6,7 +6,9 @@ import subprocess
 import time
 
 from utilities import global_variables
+from utilities.download_manager import download_manager
 from utilities.helper_util import UtilityHelper
+from utilities.process_supervisor import child_exit_watcher
 
 logging.basicConfig(level=logging.DEBUG)
 
@@ -101,7 +103,8 @@ class BlockdxUtility:
         if not os.path.exists(self.blockdx_exe):
             # self.downloading_bin = True
             logging.info(f"Blockdx executable not found at {self.blockdx_exe}. Downloading...")
-            self.download_blockdx_bin()
+            # joins the download already running from the Download button, if any
+            download_manager.run("blockdx", self.download_blockdx_bin, global_variables.blockdx_release_url)
             # self.downloading_bin = False
 
         try:
@@ -129,6 +132,7 @@ class BlockdxUtility:
                 time.sleep(1)  # Wait for 1 second before checking again
 
             pid = self.blockdx_process.pid
+            child_exit_watcher.watch("blockdx", self.blockdx_process)
             logging.info(f"Started Blockdx process with PID {pid}: {self.blockdx_exe}")
         except Exception as e:
             logging.error(f"Error: {e}")
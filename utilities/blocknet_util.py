@@ -1,18 +1,31 @@
+import hashlib
 import json
 import logging
 import os
 import random
+import re
 import shutil
 import string
 import subprocess
 import threading
 import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import requests
 
 from utilities import global_variables
+from utilities.download_manager import download_manager
+from utilities.download_util import TransferRate, cached_digest, expected_sha256, hash_file, segmented_download, \
+    write_digest_sidecar
 from utilities.helper_util import UtilityHelper
+from utilities.http_cache import http_cache
+from utilities.process_supervisor import child_exit_watcher
+from utilities.rpc_util import JSONRPCClient
+from utilities.sync_util import SyncProgress
+from utilities.zmq_util import ChainTip, ZMQBlockListener
+
+MANIFEST_INDEX_FILE = "manifest-index.json"
 
 logging.basicConfig(level=logging.DEBUG)
 
@@ -21,41 +34,12 @@ urllib3_logger = logging.getLogger('urllib3')
 urllib3_logger.setLevel(logging.WARNING)
 
 
-class BlocknetRPCClient:
-    def __init__(self, rpc_user, rpc_password, rpc_port):
-        self.rpc_user = rpc_user
-        self.rpc_password = rpc_password
-        self.rpc_port = rpc_port
-
-    def send_rpc_request(self, method=None, params=None):
-        url = f"http://localhost:{self.rpc_port}"
-        headers = {'content-type': 'application/json'}
-        auth = (self.rpc_user, self.rpc_password)
-        data = {
-            "jsonrpc": "2.0",
-            "method": method,
-            "params": params if params is not None else [],
-            "id": 1,
-        }
-        try:
-            response = requests.post(url, json=data, headers=headers, auth=auth)
-            if response.status_code != 200:
-                return None
-
-            json_answer = response.json()
-            if 'result' in json_answer:
-                return json_answer['result']
-            else:
-                logging.error(f"No result in json: {json_answer}")
-        except requests.RequestException as e:
-            return None
-        except Exception as ex:
-            logging.exception(f"An unexpected error occurred while sending RPC request: {ex}")
-            return None
+class BlocknetRPCClient(JSONRPCClient):
+    pass
 
 
 class BlocknetUtility:
-    def __init__(self, custom_path=None):
+    def __init__(self, custom_path=None, zmq_notifications=False):
         self.helper = UtilityHelper()
         self.blocknet_exe = os.path.join(global_variables.aio_folder,
                                          *global_variables.conf_data.blocknet_bin_path,
@@ -63,41 +47,121 @@ class BlocknetUtility:
         self.binary_percent_download = None
         self.parsed_wallet_confs = {}
         self.parsed_xbridge_confs = {}
+        self.prefetched_confs = {}  # (subfolder, filename) -> parsed conf of the last prefetch
+        self.conf_fetch_latencies = {}  # "subfolder/filename" -> seconds
         self.bootstrap_checking = False
         self.bootstrap_extracting = False
         self.bootstrap_percent_download = None
+        self.bootstrap_transfer_rate = None  # TransferRate of the bootstrap download in progress
         self.downloading_bin = False
         self.data_folder = get_blocknet_data_folder(custom_path)
         self.process_running = None
         self.blocknet_conf_local = None
         self.xbridge_conf_local = None
-        self.xb_manifest = retrieve_xb_manifest()
-        self.blocknet_conf_remote = retrieve_remote_blocknet_conf()
-        self.blocknet_xbridge_conf_remote = retrieve_remote_blocknet_xbridge_conf()
+        # start from the xb_conf disk cache, fresh copies are fetched in the background
+        self.xb_manifest_index = retrieve_xb_manifest_index(offline=True)  # ticker -> latest manifest entry
+        self.blocknet_conf_remote = retrieve_remote_blocknet_conf(offline=True)
+        self.blocknet_xbridge_conf_remote = retrieve_remote_blocknet_xbridge_conf(offline=True)
+        self.remote_confs_ready = threading.Event()
+        # the start thread and the xlite coins worker both rewrite the local confs
+        self.conf_lock = threading.Lock()
         self.blocknet_pids = []
         self.blocknet_process = None
         self.blocknet_rpc = None
         self.valid_rpc = False
-        self.running = True  # flag for async funcs
+        self.zmq_notifications = zmq_notifications
+        self.zmq_listener = None
+        self.chain_tip = ChainTip()
+        self.sync_progress = SyncProgress()
         self.parse_blocknet_conf()
         self.parse_xbridge_conf()
         self.init_blocknet_rpc()
-        self.start_rpc_check_thread()
+        self.start_remote_confs_refresh()
 
-    def start_rpc_check_thread(self):
-        thread = threading.Thread(target=self.check_blocknet_rpc)
+    def start_remote_confs_refresh(self):
+        thread = threading.Thread(target=self.refresh_remote_confs, name="RemoteConfsRefresh", daemon=True)
         thread.start()
 
-    def check_blocknet_rpc(self):
-        while self.running:
-            valid = False
-            if self.blocknet_rpc:
-                result = self.blocknet_rpc.send_rpc_request('getnetworkinfo')
-                if result:
-                    valid = True
-            self.valid_rpc = valid
-
-            time.sleep(2)
+    def refresh_remote_confs(self):
+        start = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=3, thread_name_prefix="RemoteConfsRefresh") as executor:
+                manifest_index = executor.submit(retrieve_xb_manifest_index)
+                blocknet_conf = executor.submit(retrieve_remote_blocknet_conf)
+                xbridge_conf = executor.submit(retrieve_remote_blocknet_xbridge_conf)
+            # keep the cached copies when a fetch gives nothing
+            self.xb_manifest_index = manifest_index.result() or self.xb_manifest_index
+            self.blocknet_conf_remote = blocknet_conf.result() or self.blocknet_conf_remote
+            self.blocknet_xbridge_conf_remote = xbridge_conf.result() or self.blocknet_xbridge_conf_remote
+        except Exception as e:
+            logging.error(f"REMOTE: refresh of remote confs failed: {e}")
+        finally:
+            self.remote_confs_ready.set()
+        logging.info(f"REMOTE: remote confs refreshed in {time.perf_counter() - start:.2f}s")
+
+    def wait_remote_confs(self, timeout=60):
+        """Block until the background refresh is done, the cached copies are used after timeout."""
+        if not self.remote_confs_ready.wait(timeout):
+            logging.warning(f"REMOTE: remote confs not refreshed after {timeout}s, using cached copies")
+
+    def probe_blocknet_rpc(self) -> bool:
+        """
+        Health probe run by the HealthScheduler. While the chain needs polling, getblockchaininfo rides in
+        the same batch as getnetworkinfo, it feeds the sync progress and, while no ZMQ events come in, the
+        chain tip. Once synced with ZMQ live only getnetworkinfo is left.
+        """
+        valid = False
+        if self.blocknet_rpc:
+            zmq_live = self.zmq_listener and self.zmq_listener.is_live()
+            if zmq_live and self.sync_progress.synced:
+                valid = bool(self.blocknet_rpc.send_rpc_request('getnetworkinfo'))
+            else:
+                network, chain = self.blocknet_rpc.batch(['getnetworkinfo', 'getblockchaininfo'])
+                valid = network.error is None and bool(network.result)
+                if chain.error is None and chain.result:
+                    self.update_blocknet_chain(chain.result, zmq_live)
+        self.valid_rpc = valid
+        return valid
+
+    def update_blocknet_chain(self, info, zmq_live):
+        self.sync_progress.update(info)
+        if not zmq_live and info.get('bestblockhash'):
+            self.chain_tip.set_tip(info['bestblockhash'], info.get('blocks'), 'rpc')
+
+    def reset_blocknet_rpc_status(self):
+        self.valid_rpc = False
+        self.chain_tip.reset()
+        self.sync_progress.reset()
+
+    def set_zmq_notifications(self, enabled):
+        """Publishers are added to or removed from blocknet.conf on the next conf check, Core needs a restart."""
+        self.zmq_notifications = enabled
+        if enabled:
+            self.start_zmq_listener()
+        elif self.zmq_listener:
+            self.zmq_listener.stop()
+            self.zmq_listener = None
+
+    def start_zmq_listener(self):
+        if self.zmq_listener and self.zmq_listener.running:
+            return
+        global_conf = self.blocknet_conf_local.get('global', {}) if self.blocknet_conf_local else {}
+        address = global_conf.get('zmqpubhashblock', global_variables.conf_data.blocknet_zmq_address)
+        self.zmq_listener = ZMQBlockListener(address, on_block=self.on_zmq_block, on_tx=self.on_zmq_tx)
+        if not self.zmq_listener.start():
+            self.zmq_listener = None
+
+    def on_zmq_block(self, block_hash):
+        height = None
+        if self.blocknet_rpc:
+            block = self.blocknet_rpc.send_rpc_request('getblock', [block_hash])
+            if block:
+                height = block.get('height')
+        if self.chain_tip.set_tip(block_hash, height, 'zmq'):
+            logging.debug(f"BLOCKNET: new block {height} {block_hash}")
+
+    def on_zmq_tx(self, tx_hash):
+        self.chain_tip.tx_count += 1
 
     def init_blocknet_rpc(self):
         if 'global' in self.blocknet_conf_local:
@@ -110,6 +174,9 @@ class BlocknetUtility:
             rpc_password = None
             rpc_port = 0
 
+        if self.blocknet_rpc:
+            # drop calls still in flight against the previous data dir / credentials
+            self.blocknet_rpc.cancel()
         if rpc_user is not None and rpc_password is not None and rpc_port != 0:
             self.blocknet_rpc = BlocknetRPCClient(rpc_user, rpc_password, rpc_port)
         else:
@@ -117,16 +184,21 @@ class BlocknetUtility:
             self.blocknet_rpc = None
 
     def start_blocknet(self):
+        if self.blocknet_process and self.blocknet_process.poll() is None:
+            logging.info(f"Blocknet process {self.blocknet_process.pid} already running, not starting another one")
+            return
         self.create_data_folder()
         if not os.path.exists(self.blocknet_exe):
             logging.info(f"Blocknet executable not found at {self.blocknet_exe}. Downloading...")
-            self.download_blocknet_bin()
+            # joins the download already running from the Download button, if any
+            download_manager.run("blocknet", self.download_blocknet_bin, global_variables.blocknet_release_url)
         try:
             self.blocknet_process = subprocess.Popen([self.blocknet_exe, f"-datadir={self.data_folder}"],
                                                      stdout=subprocess.PIPE,
                                                      stderr=subprocess.PIPE,
                                                      stdin=subprocess.PIPE,
                                                      start_new_session=True)
+            child_exit_watcher.watch("blocknet", self.blocknet_process)
             logging.info(f"Started Blocknet process: {self.blocknet_exe} with data directory: {self.data_folder}")
         except Exception as e:
             logging.error(f"Error: {e}")
@@ -204,6 +276,7 @@ class BlocknetUtility:
         save_conf_to_file(self.xbridge_conf_local, conf_file_path)
 
     def check_blocknet_conf(self):
+        self.wait_remote_confs()
         self.parse_blocknet_conf()
         old_local_json = json.dumps(self.blocknet_conf_local, sort_keys=True)
 
@@ -242,6 +315,13 @@ class BlocknetUtility:
 
         self.blocknet_conf_local[section_name]['addnode'] = addnode_value
 
+        for key in ('zmqpubhashblock', 'zmqpubhashtx'):
+            if self.zmq_notifications:
+                if not self.blocknet_conf_local[section_name].get(key):
+                    self.blocknet_conf_local[section_name][key] = global_variables.conf_data.blocknet_zmq_address
+            elif self.blocknet_conf_local[section_name].pop(key, None) is not None:
+                logging.info(f"Removed {key}, ZMQ notifications are disabled")
+
         for section, options in self.blocknet_conf_remote.items():
             for key, value in options.items():
                 if key == 'rpcuser' or key == 'rpcpassword':
@@ -270,30 +350,64 @@ class BlocknetUtility:
             logging.info("Local blocknet.conf remains the same. No need to save.")
             return False
 
+    def coin_conf_files(self, coin):
+        """Return the (subfolder, filename) of the xbridge and wallet confs of a coin, None if not in the manifest."""
+        latest_version = self.xb_manifest_index.get(coin.upper())
+        if not latest_version:
+            return None
+        return ("xbridge-confs", latest_version['xbridge_conf']), ("wallet-confs", latest_version['wallet_conf'])
+
+    def prefetch_coin_confs(self, coins, max_workers=8):
+        """
+        Resolve the conf files of all coins in parallel, files shared by several coins are fetched once.
+        Results are kept in prefetched_confs for retrieve_coin_conf.
+        """
+        files = set()
+        for coin in coins:
+            conf_files = self.coin_conf_files(coin)
+            if conf_files:
+                files.update(conf_files)
+        self.prefetched_confs = {}
+        if not files:
+            return
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(files)), thread_name_prefix="ConfPrefetch") as executor:
+            futures = {executor.submit(timed_retrieve_remote_conf, subfolder, filename): (subfolder, filename)
+                       for subfolder, filename in files}
+            for future in as_completed(futures):
+                subfolder, filename = futures[future]
+                try:
+                    parsed_conf, latency = future.result()
+                except Exception as e:
+                    logging.error(f"REMOTE: prefetch of {subfolder}/{filename} failed: {e}")
+                    continue
+                self.conf_fetch_latencies[f"{subfolder}/{filename}"] = latency
+                logging.debug(f"REMOTE: prefetched {subfolder}/{filename} in {latency * 1000:.0f}ms")
+                if parsed_conf is not None:
+                    self.prefetched_confs[(subfolder, filename)] = parsed_conf
+        logging.info(f"REMOTE: prefetched {len(files)} conf files for {len(coins)} coins in "
+                     f"{time.perf_counter() - start:.2f}s")
+
     def retrieve_coin_conf(self, coin):
-        latest_version = None
-        highest_version_id = None
-
-        for entry in self.xb_manifest:
-            if 'ticker' in entry and entry['ticker'] == coin.upper():
-                ver_id = entry['ver_id']
-                if latest_version is None or ver_id > highest_version_id:
-                    latest_version = entry
-                    highest_version_id = ver_id
-
-        if latest_version:
-            xbridge_conf = latest_version['xbridge_conf']
-            xbridge_url = f"{global_variables.conf_data.remote_blockchain_configuration_repo}/xbridge-confs/{xbridge_conf}"
-            wallet_conf = latest_version['wallet_conf']
-            wallet_conf_url = f"{global_variables.conf_data.remote_blockchain_configuration_repo}/wallet-confs/{wallet_conf}"
-            parsed_xbridge_conf = retrieve_remote_conf(xbridge_url, "xbridge-confs", xbridge_conf)
-            parsed_wallet_conf = retrieve_remote_conf(wallet_conf_url, "wallet-confs", wallet_conf)
-            self.parsed_xbridge_confs[coin] = parsed_xbridge_conf
-            self.parsed_wallet_confs[coin] = parsed_wallet_conf
+        conf_files = self.coin_conf_files(coin)
+
+        if conf_files:
+            parsed = []
+            for subfolder, filename in conf_files:
+                parsed_conf = self.prefetched_confs.get((subfolder, filename))
+                if parsed_conf is None:
+                    parsed_conf = retrieve_remote_conf(remote_conf_url(subfolder, filename), subfolder, filename)
+                parsed.append(parsed_conf)
+            self.parsed_xbridge_confs[coin], self.parsed_wallet_confs[coin] = parsed
         else:
             logging.error("No entries found in the manifest. " + coin)
 
     def check_xbridge_conf(self, xlite_daemon_conf):
+        with self.conf_lock:
+            return self._check_xbridge_conf(xlite_daemon_conf)
+
+    def _check_xbridge_conf(self, xlite_daemon_conf):
+        self.wait_remote_confs()
         self.parse_xbridge_conf()
         old_local_json = json.dumps(self.xbridge_conf_local, sort_keys=True)
 
@@ -308,6 +422,7 @@ class BlocknetUtility:
             logging.error("Local xbridge.conf not available.")
             return False
         if xlite_daemon_conf:
+            self.prefetch_coin_confs([coin for coin in xlite_daemon_conf if coin != "master"])
             for coin in xlite_daemon_conf:
                 if coin == "master":
                     continue
@@ -366,8 +481,9 @@ class BlocknetUtility:
             return False
 
     def compare_and_update_local_conf(self, xlite_daemon_conf=None):
-        self.check_blocknet_conf()
-        self.check_xbridge_conf(xlite_daemon_conf)
+        with self.conf_lock:
+            self.check_blocknet_conf()
+            self._check_xbridge_conf(xlite_daemon_conf)
 
     def create_data_folder(self):
         if self.data_folder and not os.path.exists(self.data_folder):
@@ -384,36 +500,45 @@ class BlocknetUtility:
         self.bootstrap_checking = True
         filename = "Blocknet.zip"
         local_file_path = os.path.join(global_variables.aio_folder, filename)
-        remote_file_size = get_remote_file_size(global_variables.conf_data.blocknet_bootstrap_url)
-        need_to_download = True
-        if os.path.exists(local_file_path):
-            local_file_size = os.path.getsize(local_file_path)
-
-            if local_file_size == remote_file_size:
-                logging.info("Bootstrap file already exists on disk and matches the remote file.")
-                need_to_download = False
-            else:
-                logging.info("Local bootstrap file exists but does not match the remote file. Re-downloading...")
-                os.remove(local_file_path)
+        url = global_variables.conf_data.blocknet_bootstrap_url
         try:
+            sha256 = expected_sha256(url)
+            remote_file_size = None
+            need_to_download = True
+            if os.path.exists(local_file_path):
+                # the size recorded with the digest is the local file size, cached_digest rejects any mismatch
+                local_digest = cached_digest(local_file_path, url)
+                if sha256 and local_digest == sha256:
+                    # matches the pinned or published digest: no need to ask the server
+                    need_to_download = False
+                else:
+                    remote_file_size = get_remote_file_size(url)
+                    if os.path.getsize(local_file_path) == remote_file_size:
+                        if not local_digest:
+                            # downloaded before digests were recorded, hashed once
+                            local_digest = hash_file(local_file_path).hexdigest()
+                            write_digest_sidecar(local_file_path, url, local_digest)
+                        need_to_download = bool(sha256) and local_digest != sha256
+                if need_to_download:
+                    logging.info("Local bootstrap file exists but does not match the remote file. Re-downloading...")
+                    os.remove(local_file_path)
+                else:
+                    logging.info("Bootstrap file already exists on disk and matches the remote file.")
             if need_to_download:
-                with open(local_file_path, 'wb') as f:
-                    response = requests.get(global_variables.conf_data.blocknet_bootstrap_url, stream=True,
-                                            timeout=(10, 30))
-                    response.raise_for_status()
-                    if response.status_code == 200:
-                        logging.info(
-                            f"Downloading {global_variables.conf_data.blocknet_bootstrap_url} to {local_file_path}, remote size: {int(remote_file_size / 1024)} kb")
-                        bytes_downloaded = 0
-                        for chunk in response.iter_content(chunk_size=8192):
-                            if chunk:
-                                f.write(chunk)
-                                bytes_downloaded += len(chunk)
-                                self.bootstrap_percent_download = (bytes_downloaded / remote_file_size) * 100
-                    else:
-                        logging.error("Failed to download the Blocknet Bootstrap.")
-
+                if remote_file_size is None:
+                    remote_file_size = get_remote_file_size(url)
+                logging.info(
+                    f"Downloading {url} to {local_file_path}, remote size: {int(remote_file_size / 1024)} kb")
+
+                def progress(bytes_downloaded, total):
+                    self.bootstrap_percent_download = (bytes_downloaded / (total or remote_file_size)) * 100
+
+                # parallel byte ranges when the server supports them, resumes Blocknet.zip.part either way
+                self.bootstrap_transfer_rate = TransferRate()
+                segmented_download(url, local_file_path, remote_file_size, progress=progress,
+                                   transfer_rate=self.bootstrap_transfer_rate, sha256=sha256)
                 self.bootstrap_percent_download = None
+                self.bootstrap_transfer_rate = None
 
                 if os.path.getsize(local_file_path) != remote_file_size:
                     os.remove(local_file_path)
@@ -438,11 +563,13 @@ class BlocknetUtility:
                 self.bootstrap_extracting = True
                 zip_ref.extractall(self.data_folder)
             self.bootstrap_extracting = False
+            self.sync_progress.bootstrap_applied = True
             logging.info("Extraction completed.")
 
         except Exception as e:
             logging.error(f"An error occurred: {str(e)}")
             self.bootstrap_percent_download = None
+            self.bootstrap_transfer_rate = None
         finally:
             self.bootstrap_checking = False
 
@@ -494,79 +621,111 @@ def save_conf_to_file(conf_data, file_path):
         return False
 
 
-def retrieve_remote_conf(remote_url, subfolder, expected_filename):
+def retrieve_remote_conf(remote_url, subfolder, expected_filename, offline=False):
     folder = "xb_conf"
     local_conf_file = os.path.join(global_variables.aio_folder, folder, subfolder, expected_filename)
+    return download_remote_conf(remote_url, local_conf_file, offline)
 
-    if os.path.exists(local_conf_file):
-        try:
-            with open(local_conf_file, 'r') as f:
-                conf_data = f.read()
-            parsed_conf = parse_conf_file(input_string=conf_data)
-            if parsed_conf:
-                logging.info(f"REMOTE: found and parsed ok: [{local_conf_file}]")
-                return parsed_conf
-            else:
-                logging.error(f"Failed to parse: {local_conf_file}")
-        except Exception as e:
-            logging.error(f"{local_conf_file} Error opening or parsing file: {e}")
 
-    return download_remote_conf(remote_url, local_conf_file)
+def remote_conf_url(subfolder, filename):
+    return f"{global_variables.conf_data.remote_blockchain_configuration_repo}/{subfolder}/{filename}"
 
 
-def download_remote_conf(url, filepath):
-    try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            conf_data = response.text
-            parsed_conf = parse_conf_file(input_string=conf_data)
-            if parsed_conf:
-                save_conf_to_file(parsed_conf, filepath)
-                logging.info(f"retrieved and parsed ok: [{filepath}]")
-                return parsed_conf
-            else:
-                logging.error(f"Failed to parse {filepath} ")
-                return None
-        else:
-            logging.error(
-                f"Failed to retrieve remote blocknet configuration file: {url} {response.status_code}")
-            return None
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Error retrieving remote blocknet configuration file: {e}")
-        return None
+def timed_retrieve_remote_conf(subfolder, filename):
+    start = time.perf_counter()
+    parsed_conf = retrieve_remote_conf(remote_conf_url(subfolder, filename), subfolder, filename)
+    return parsed_conf, time.perf_counter() - start
 
 
-def retrieve_xb_manifest():
+def download_remote_conf(url, filepath, offline=False):
+    # conditional request, the copy on disk is reused on 304 and when offline
+    cached = http_cache.get(url, filepath, offline)
+    if cached is None:
+        if offline:
+            return None
+        logging.error(f"Failed to retrieve remote blocknet configuration file: {url}")
+        return None
+    try:
+        parsed_conf = parse_conf_file(input_string=cached.text)
+    except Exception as e:
+        logging.error(f"{filepath} Error parsing file: {e}")
+        return None
+    if parsed_conf:
+        logging.info(f"REMOTE: retrieved and parsed ok ({cached.status}): [{filepath}]")
+        return parsed_conf
+    logging.error(f"Failed to parse {filepath} ")
+    return None
+
+
+def parse_ver_id(ver_id):
+    """'bitcoin--v22.0.0' -> (22, 0, 0), compared numerically so v0.9 sorts before v0.10"""
+    version = ver_id.rsplit('--', 1)[-1]
+    return tuple(int(part) for part in re.findall(r'\d+', version))
+
+
+def build_xb_manifest_index(manifest):
+    """Map each ticker to the fields needed from its latest manifest entry."""
+    index = {}
+    for entry in manifest:
+        ticker = entry.get('ticker')
+        ver_id = entry.get('ver_id')
+        if not ticker or not ver_id:
+            continue
+        current = index.get(ticker)
+        if current is None or (parse_ver_id(ver_id), ver_id) > (parse_ver_id(current['ver_id']), current['ver_id']):
+            index[ticker] = {'ver_id': ver_id,
+                             'xbridge_conf': entry.get('xbridge_conf'),
+                             'wallet_conf': entry.get('wallet_conf')}
+    return index
+
+
+def retrieve_xb_manifest_index(offline=False):
     folder = "xb_conf"
     filename = os.path.basename(global_variables.conf_data.remote_manifest_url)
     local_manifest_file = os.path.join(global_variables.aio_folder, folder, filename)
+    local_index_file = os.path.join(global_variables.aio_folder, folder, MANIFEST_INDEX_FILE)
+
+    cached = http_cache.get(global_variables.conf_data.remote_manifest_url, local_manifest_file, offline)
+    if cached is None:
+        if offline:
+            return {}
+        logging.error(f"Failed to retrieve remote configuration file: {global_variables.conf_data.remote_manifest_url}")
+        return {}
+    # the index is only rebuilt when the manifest content changed
+    digest = hashlib.sha256(cached.content).hexdigest()
+    try:
+        with open(local_index_file, 'r') as f:
+            saved = json.load(f)
+        if saved.get('manifest_sha256') == digest:
+            logging.info(f"REMOTE: manifest index up to date ({cached.status}): [{local_index_file}]")
+            return saved['tickers']
+    except (FileNotFoundError, json.JSONDecodeError, KeyError, AttributeError):
+        pass
 
     try:
-        response = requests.get(global_variables.conf_data.remote_manifest_url)
-        if response.status_code == 200:
-            parsed_json = response.json()
-            os.makedirs(os.path.dirname(local_manifest_file), exist_ok=True)
-            with open(local_manifest_file, 'w') as f:
-                f.write(json.dumps(parsed_json, indent=4))
-            logging.info(f"REMOTE: Retrieved and parsed ok: [{local_manifest_file}]")
-            return parsed_json
-        else:
-            logging.error(
-                f"Failed to retrieve remote configuration file: {global_variables.conf_data.remote_manifest_url} {response.status_code}")
-            return None
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Error retrieving remote configuration file: {e}")
-        return None
+        index = build_xb_manifest_index(json.loads(cached.content))
+    except (ValueError, AttributeError) as e:
+        logging.error(f"Error parsing {local_manifest_file}: {e}")
+        return {}
+    try:
+        with open(local_index_file, 'w') as f:
+            json.dump({'manifest_sha256': digest, 'tickers': index}, f, separators=(',', ':'))
+    except OSError as e:
+        logging.error(f"Error saving {local_index_file}: {e}")
+    logging.info(f"REMOTE: Retrieved and indexed {len(index)} tickers ({cached.status}): [{local_manifest_file}]")
+    return index
 
 
-def retrieve_remote_blocknet_conf():
+def retrieve_remote_blocknet_conf(offline=False):
     filename = os.path.basename(global_variables.conf_data.remote_blocknet_conf_url)
-    return retrieve_remote_conf(global_variables.conf_data.remote_blocknet_conf_url, "wallet-confs", filename)
+    return retrieve_remote_conf(global_variables.conf_data.remote_blocknet_conf_url, "wallet-confs", filename,
+                                offline)
 
 
-def retrieve_remote_blocknet_xbridge_conf():
+def retrieve_remote_blocknet_xbridge_conf(offline=False):
     filename = os.path.basename(global_variables.conf_data.remote_xbridge_conf_url)
-    return retrieve_remote_conf(global_variables.conf_data.remote_xbridge_conf_url, "xbridge-confs", filename)
+    return retrieve_remote_conf(global_variables.conf_data.remote_xbridge_conf_url, "xbridge-confs", filename,
+                                offline)
 
 
 def parse_conf_file(file_path=None, input_string=None):
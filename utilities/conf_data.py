@@ -6,6 +6,8 @@ aio_blocknet_data_path = {
 }
 
 blocknet_bootstrap_url = "https://utils.blocknet.org/Blocknet.zip"
+# ZMQ publisher endpoint set in blocknet.conf when block notifications are enabled
+blocknet_zmq_address = "tcp://127.0.0.1:41420"
 nodes_to_add = [
     "130.185.119.91:41412",
     "75.119.135.155:41412",
@@ -34,6 +36,11 @@ xlite_releases_urls = {
     ("Linux", "x86_64"): "https://github.com/blocknetdx/xlite/releases/download/v1.0.7/XLite-1.0.7-linux.tar.gz",
     ("Darwin", "x86_64"): "https://github.com/blocknetdx/xlite/releases/download/v1.0.7/XLite-1.0.7-mac.dmg"
 }
+# Expected SHA-256 of the files above (and of the bootstrap), url -> hex digest. Only add digests checked
+# against the published release, a download not matching its pinned digest is rejected.
+release_sha256 = {}
+# url -> checksum file in sha256sum format, read when no digest is pinned for the url
+release_checksum_urls = {}
 
 # apps default data path
 blocknet_default_paths = {
@@ -0,0 +1,201 @@
+import itertools
+import logging
+import threading
+import time
+from urllib.parse import urlparse
+
+from utilities.download_util import TransferRate, job_context
+from utilities.sync_util import format_duration
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 10
+PRIORITY_LOW = 20  # large downloads that should not hold back the others, e.g. the bootstrap
+
+
+class TokenBucket:
+    """
+    Global bandwidth cap shared by every download, rate in bytes per second, None for no cap.
+    Bytes are taken as they arrive, a reader running into debt sleeps until the bucket refilled it.
+    """
+
+    def __init__(self, rate=None, burst_seconds: float = 1):
+        self.burst_seconds: float = burst_seconds
+        self.lock = threading.Lock()
+        self.set_rate(rate)
+
+    def set_rate(self, rate) -> None:
+        with self.lock:
+            self.rate = rate or None
+            self.burst: float = (self.rate or 0) * self.burst_seconds
+            self.tokens: float = self.burst
+            self.updated: float = time.monotonic()
+
+    def consume(self, amount: int) -> None:
+        with self.lock:
+            if not self.rate:
+                return
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= amount
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+class DownloadJob:
+    """A queued download, func() runs on its own thread and reports through the download_util functions."""
+
+    def __init__(self, name: str, func, url: str, priority: int, seq: int):
+        self.name: str = name
+        self.func = func
+        self.url: str = url
+        self.host: str = urlparse(url).hostname or ""
+        self.priority: int = priority
+        self.seq: int = seq
+        self.state: str = "queued"  # queued, running, done or failed
+        self.done: int = 0
+        self.total: int = 0
+        self.transfer_rate: TransferRate = TransferRate()
+        self.result = None
+        self.error = None
+        self.finished = threading.Event()
+        self.bucket: TokenBucket = None
+        self.last_done = None
+
+    def report(self, done: int, total: int) -> None:
+        """Progress of the running download, throttled by the manager's bandwidth cap."""
+        # the first report of a download carries what a resume found on disk, not what was fetched
+        delta = done - self.last_done if self.last_done is not None and done > self.last_done else 0
+        self.last_done = done
+        self.done = done
+        self.total = total
+        self.transfer_rate.update(done)
+        if delta and self.bucket:
+            self.bucket.consume(delta)
+
+    def percent(self):
+        return self.done / self.total * 100 if self.total else None
+
+    def rate(self):
+        """Bytes per second."""
+        return self.transfer_rate.rate()
+
+    def eta(self):
+        """Seconds left, None while unknown."""
+        rate = self.rate()
+        if not rate or not self.total:
+            return None
+        return max(self.total - self.done, 0) / rate
+
+    def wait(self, timeout=None):
+        """Block until the job finished, return what func returned or raise what it raised."""
+        self.finished.wait(timeout)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class DownloadManager:
+    """
+    Single queue for every download of the app. Jobs start by priority, then submission order, with at most
+    max_active running at once and at most per_host against the same host. An optional token bucket caps
+    the bandwidth all of them share.
+    """
+
+    def __init__(self, max_active: int = 3, per_host: int = 2, bandwidth_limit=None):
+        self.max_active: int = max_active
+        self.per_host: int = per_host
+        self.bucket: TokenBucket = TokenBucket(bandwidth_limit)
+        self.jobs: dict = {}  # name -> last DownloadJob submitted under that name
+        self.queue: list = []
+        self.active: dict = {}  # host -> running jobs
+        self.counter = itertools.count()
+        self.lock = threading.Lock()
+
+    def set_bandwidth_limit(self, bytes_per_second) -> None:
+        self.bucket.set_rate(bytes_per_second)
+        logging.info(f"DownloadManager: bandwidth limit "
+                     f"{f'{bytes_per_second / 1024:.0f} KB/s' if bytes_per_second else 'disabled'}")
+
+    def submit(self, name: str, func, url: str, priority: int = PRIORITY_NORMAL) -> DownloadJob:
+        """Queue func, a job still queued or running under the same name is returned instead."""
+        with self.lock:
+            job = self.jobs.get(name)
+            if job is not None and not job.finished.is_set():
+                return job
+            job = DownloadJob(name, func, url, priority, next(self.counter))
+            job.bucket = self.bucket
+            self.jobs[name] = job
+            self.queue.append(job)
+            logging.info(f"DownloadManager: queued {name} [{url}], priority {priority}")
+            self._dispatch()
+        return job
+
+    def run(self, name: str, func, url: str, priority: int = PRIORITY_NORMAL):
+        """Queue func and wait for it, for callers that already run on a worker thread."""
+        return self.submit(name, func, url, priority).wait()
+
+    def get(self, name: str):
+        return self.jobs.get(name)
+
+    def _dispatch(self) -> None:
+        # called with the lock held
+        running = sum(len(jobs) for jobs in self.active.values())
+        for job in sorted(self.queue, key=lambda j: (j.priority, j.seq)):
+            if running >= self.max_active:
+                break
+            if len(self.active.get(job.host, [])) >= self.per_host:
+                continue
+            self.queue.remove(job)
+            self.active.setdefault(job.host, []).append(job)
+            running += 1
+            job.state = "running"
+            threading.Thread(target=self._run, args=(job,), name=f"Download-{job.name}", daemon=True).start()
+
+    def _run(self, job: DownloadJob) -> None:
+        start = time.monotonic()
+        job_context.job = job
+        try:
+            job.result = job.func()
+            job.state = "done"
+            rate = job.transfer_rate.average()
+            logging.info(f"DownloadManager: {job.name} done in {time.monotonic() - start:.1f}s"
+                         f"{f', {rate / 1048576:.2f} MB/s' if job.done else ''}")
+        except Exception as e:
+            job.error = e
+            job.state = "failed"
+            logging.error(f"DownloadManager: {job.name} failed: {e}")
+        finally:
+            job_context.job = None
+            with self.lock:
+                self.active[job.host].remove(job)
+                job.finished.set()
+                self._dispatch()
+
+
+def format_download_status(job: DownloadJob) -> str:
+    """Short state of a job for the download buttons, empty once it finished."""
+    if job is None or job.finished.is_set():
+        return ""
+    if job.state == "queued":
+        return "Queued"
+    percent = job.percent()
+    return f"{int(percent)}%" if percent is not None else ""
+
+
+def format_download_telemetry(job: DownloadJob) -> str:
+    """Throughput and ETA of a job for the tooltips, empty unless it is transferring."""
+    if job is None or job.finished.is_set() or job.state != "running" or not job.total:
+        return ""
+    text = f"{job.done / 1048576:.1f}/{job.total / 1048576:.1f} MB"
+    rate = job.rate()
+    if rate is not None:
+        text += f" | {rate / 1048576:.2f} MB/s"
+    eta = job.eta()
+    if eta is not None:
+        text += f" | ETA {format_duration(eta)}"
+    return text
+
+
+download_manager = DownloadManager()
@@ -0,0 +1,559 @@
+import hashlib
+import json
+import logging
+import os
+import random
+import shutil
+import tarfile
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from typing import NamedTuple
+
+import requests
+import urllib3
+
+from utilities import global_variables
+from utilities.process_telemetry import RingBuffer
+
+CHUNK_SIZE = 65536
+SEGMENTS = 4
+MIN_SEGMENT_SIZE = 16 * 1024 * 1024
+
+# DownloadJob run by the DownloadManager on this thread, if any
+job_context = threading.local()
+
+
+def tracked(progress):
+    """
+    Route a progress callback through the DownloadJob running on the calling thread, which measures and
+    throttles the transfer. Resolved once per download, so segment threads report to the same job.
+    """
+    job = getattr(job_context, 'job', None)
+    if job is None:
+        return progress
+
+    def report(done, total):
+        job.report(done, total)
+        if progress:
+            progress(done, total)
+
+    return report
+
+
+class DownloadError(Exception):
+    pass
+
+
+class RetryableDownloadError(Exception):
+    pass
+
+
+class DownloadResult(NamedTuple):
+    size: int
+    sha256: str
+
+
+class TransferRate:
+    """Aggregate throughput of a transfer, smoothed over the last samples."""
+
+    def __init__(self, window: int = 20, min_interval: float = 0.5):
+        self.min_interval: float = min_interval
+        self.sizes: RingBuffer = RingBuffer(window)
+        self.times: RingBuffer = RingBuffer(window)
+        self.started: float = time.monotonic()
+        self.done: int = 0
+
+    def update(self, done: int) -> None:
+        self.done = done
+        now = time.monotonic()
+        if not len(self.times) or now - self.times.latest() >= self.min_interval:
+            self.sizes.append(done)
+            self.times.append(now)
+
+    def rate(self):
+        """Bytes per second, None until two samples are known."""
+        if len(self.times) < 2:
+            return None
+        sizes = self.sizes.values()
+        times = self.times.values()
+        elapsed = times[-1] - times[0]
+        return (sizes[-1] - sizes[0]) / elapsed if elapsed > 0 else None
+
+    def average(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return self.done / elapsed if elapsed > 0 else 0
+
+
+class PartialDownload:
+    """
+    A .part file plus a json sidecar holding the URL, the expected size and the validator
+    (ETag / Last-Modified) of the response it was started from, so a later attempt can resume it.
+    """
+
+    def __init__(self, dest_path: str):
+        self.dest_path: str = dest_path
+        self.part_path: str = f"{dest_path}.part"
+        self.meta_path: str = f"{dest_path}.part.json"
+        self.meta: dict = {}
+
+    def load(self, url: str) -> int:
+        """Return the number of bytes that can be resumed, 0 when the partial belongs to another URL."""
+        try:
+            with open(self.meta_path, 'r') as f:
+                self.meta = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.meta = {}
+        # a segmented partial is preallocated, its size says nothing about what was written
+        if self.meta.get('url') != url or self.meta.get('segments') or not os.path.exists(self.part_path):
+            self.discard()
+            return 0
+        return os.path.getsize(self.part_path)
+
+    def validator(self):
+        return self.meta.get('etag') or self.meta.get('last_modified')
+
+    def save(self, url: str, size, response: requests.Response) -> None:
+        self.meta = {'url': url,
+                     'size': size,
+                     'etag': response.headers.get('ETag'),
+                     'last_modified': response.headers.get('Last-Modified')}
+        with open(self.meta_path, 'w') as f:
+            json.dump(self.meta, f)
+
+    def discard(self) -> None:
+        self.meta = {}
+        for path in (self.part_path, self.meta_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def complete(self) -> None:
+        os.replace(self.part_path, self.dest_path)
+        if os.path.exists(self.meta_path):
+            os.remove(self.meta_path)
+
+
+def resumable_download(url: str, dest_path: str, progress=None, sha256: str = None, retries: int = 5,
+                       base_delay: float = 2, max_delay: float = 60, timeout=(10, 30),
+                       session: requests.Session = None) -> DownloadResult:
+    """
+    Download url to dest_path through a resumable .part file. Dropped connections are retried with
+    exponential backoff, resuming with Range / If-Range from what is already on disk.
+    :param progress: optional callback(bytes_done, total_size), total_size is 0 when unknown
+    :param sha256: expected hex digest, the file is deleted and ValueError raised when it differs
+    :return: DownloadResult, the digest is computed while the chunks arrive
+    """
+    http = session or requests
+    progress = tracked(progress)
+    partial = PartialDownload(dest_path)
+    attempt = 0
+    while True:
+        hasher = None
+        offset = partial.load(url)
+        headers = {}
+        if offset and partial.validator():
+            headers['Range'] = f"bytes={offset}-"
+            headers['If-Range'] = partial.validator()
+        elif offset:
+            # nothing to tell the server the file did not change in the meantime
+            partial.discard()
+            offset = 0
+        try:
+            with http.get(url, headers=headers, stream=True, timeout=timeout) as response:
+                if response.status_code == 416 and offset:
+                    if offset == partial.meta.get('size'):
+                        hasher = hash_file(partial.part_path)
+                        break
+                    partial.discard()
+                    raise RetryableDownloadError(f"range {offset}- not satisfiable, restarting")
+                if response.status_code >= 500:
+                    raise RetryableDownloadError(f"HTTP {response.status_code}")
+                response.raise_for_status()
+                if response.status_code == 206:
+                    content_range = response.headers.get('Content-Range', '')
+                    if not content_range.startswith(f"bytes {offset}-"):
+                        partial.discard()
+                        raise RetryableDownloadError(f"unexpected Content-Range '{content_range}', restarting")
+                    total = partial.meta.get('size') or 0
+                    logging.info(f"Resuming download of {url} at {offset}/{total} bytes")
+                    hasher = hash_file(partial.part_path, offset)
+                else:
+                    # full body: first attempt, or the file changed and If-Range sent it all again
+                    offset = 0
+                    total = int(response.headers.get('Content-Length', 0))
+                    partial.save(url, total, response)
+                    hasher = hashlib.sha256()
+                done = offset
+                with open(partial.part_path, 'ab' if offset else 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                        if chunk:
+                            f.write(chunk)
+                            hasher.update(chunk)
+                            done += len(chunk)
+                            if progress:
+                                progress(done, total)
+            if total and done < total:
+                raise RetryableDownloadError(f"connection closed at {done}/{total} bytes")
+            if total and done > total:
+                partial.discard()
+                raise DownloadError(f"Download size mismatch for {url}: {done} > {total} bytes")
+            break
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                requests.exceptions.ChunkedEncodingError, RetryableDownloadError) as e:
+            attempt += 1
+            if attempt > retries:
+                raise DownloadError(f"Download of {url} failed after {retries} retries: {e}") from e
+            delay = min(base_delay * 2 ** (attempt - 1), max_delay) * random.uniform(0.8, 1.2)
+            logging.warning(f"Download of {url} interrupted ({e}), retry {attempt}/{retries} in {delay:.1f}s")
+            time.sleep(delay)
+
+    return finish_download(partial, url, hasher.hexdigest(), sha256)
+
+
+def finish_download(partial: PartialDownload, url: str, digest: str, sha256: str = None) -> DownloadResult:
+    """Check the digest of a complete .part file, move it into place and record the digest next to it."""
+    if sha256 and digest != sha256.lower():
+        partial.discard()
+        raise ValueError(f"SHA-256 mismatch for {url}: {digest} != {sha256}")
+    partial.complete()
+    size = os.path.getsize(partial.dest_path)
+    write_digest_sidecar(partial.dest_path, url, digest)
+    logging.info(f"Downloaded {url} to {partial.dest_path} ({size} bytes, sha256 {digest}"
+                 f"{', verified' if sha256 else ''})")
+    return DownloadResult(size, digest)
+
+
+def hash_file(path: str, length: int = None):
+    """sha256 object fed with the first length bytes of path, the whole file when None."""
+    hasher = hashlib.sha256()
+    left = os.path.getsize(path) if length is None else length
+    with open(path, 'rb') as f:
+        while left > 0:
+            chunk = f.read(min(CHUNK_SIZE * 16, left))
+            if not chunk:
+                break
+            hasher.update(chunk)
+            left -= len(chunk)
+    return hasher
+
+
+def write_digest_sidecar(path: str, url: str, digest: str) -> None:
+    """Remember the digest of a downloaded file, with the size and mtime it had, in path.sha256.json."""
+    stat = os.stat(path)
+    try:
+        with open(f"{path}.sha256.json", 'w') as f:
+            json.dump({'url': url, 'sha256': digest, 'size': stat.st_size, 'mtime': stat.st_mtime}, f)
+    except OSError as e:
+        logging.error(f"Error saving digest of {path}: {e}")
+
+
+def remove_digest_sidecar(path: str) -> None:
+    if os.path.exists(f"{path}.sha256.json"):
+        os.remove(f"{path}.sha256.json")
+
+
+def cached_digest(path: str, url: str):
+    """Digest recorded when path was downloaded from url, None when the file was changed since or is unknown."""
+    try:
+        with open(f"{path}.sha256.json", 'r') as f:
+            meta = json.load(f)
+        stat = os.stat(path)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if meta.get('url') != url or meta.get('size') != stat.st_size or meta.get('mtime') != stat.st_mtime:
+        return None
+    return meta.get('sha256')
+
+
+def expected_sha256(url: str, timeout=(5, 15)):
+    """
+    Digest url is expected to have: pinned in conf_data.release_sha256, else read from the checksum file
+    listed for it in conf_data.release_checksum_urls. None when neither is known.
+    """
+    conf_data = global_variables.conf_data
+    pinned = conf_data.release_sha256.get(url)
+    if pinned:
+        return pinned.lower()
+    checksum_url = conf_data.release_checksum_urls.get(url)
+    if not checksum_url:
+        return None
+    try:
+        response = requests.get(checksum_url, timeout=timeout)
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        logging.warning(f"Could not retrieve checksum file {checksum_url}: {e}")
+        return None
+    return parse_checksum_file(response.text, os.path.basename(url))
+
+
+def parse_checksum_file(text: str, filename: str):
+    """Digest of filename in sha256sum output ('<digest>  <name>' lines), or of a file holding one digest."""
+    lines = [line.split() for line in text.splitlines() if line.strip()]
+    for fields in lines:
+        if len(fields) >= 2 and fields[-1].lstrip('*') == filename:
+            return fields[0].lower()
+    if len(lines) == 1 and len(lines[0]) == 1 and len(lines[0][0]) == 64:
+        return lines[0][0].lower()
+    return None
+
+
+class Segment:
+    def __init__(self, start: int, end: int, pos: int = None):
+        self.start: int = start
+        self.end: int = end  # inclusive, as in a Range header
+        self.pos: int = start if pos is None else pos  # next byte to fetch
+
+    @property
+    def remaining(self) -> int:
+        return self.end + 1 - self.pos
+
+
+def split_segments(size: int, segments: int, min_segment_size: int = None) -> list:
+    count = max(1, min(segments, size // (min_segment_size or MIN_SEGMENT_SIZE)))
+    step = -(-size // count)
+    return [Segment(start, min(start + step, size) - 1) for start in range(0, size, step)]
+
+
+def probe_ranges(url: str, timeout=(10, 30)):
+    """
+    Ask for the first byte to learn whether the server honours Range requests.
+    :return: (total size from Content-Range, validator) or None when ranges are not supported
+    """
+    with requests.get(url, headers={'Range': "bytes=0-0"}, stream=True, timeout=timeout) as response:
+        response.raise_for_status()
+        content_range = response.headers.get('Content-Range', '')
+        if response.status_code != 206 or '/' not in content_range:
+            return None
+        total = content_range.rsplit('/', 1)[1]
+        return (int(total) if total.isdigit() else None,
+                response.headers.get('ETag') or response.headers.get('Last-Modified'))
+
+
+def segmented_download(url: str, dest_path: str, size: int, segments: int = SEGMENTS, progress=None,
+                       transfer_rate: TransferRate = None, sha256: str = None, retries: int = 5,
+                       base_delay: float = 2, max_delay: float = 60, timeout=(10, 30)) -> DownloadResult:
+    """
+    Download url to dest_path over parallel connections, one byte range each, written in place into a
+    preallocated .part file. Falls back to resumable_download when the server does not support ranges
+    or the file is too small to be worth splitting. Segment offsets are kept in the .part.json sidecar
+    so an interrupted download resumes every segment where it stopped. The digest is computed by a thread
+    following the contiguous prefix written so far, reading it back while it is still in the page cache.
+    :param size: expected size, as returned by a HEAD request
+    :param progress: optional callback(bytes_done, total_size)
+    :param transfer_rate: optional TransferRate updated with the aggregate progress
+    :param sha256: expected hex digest, the file is deleted and ValueError raised when it differs
+    """
+    probe = probe_ranges(url, timeout) if size >= 2 * MIN_SEGMENT_SIZE and segments > 1 else None
+    if probe is None:
+        logging.info(f"Segmented download not possible for {url}, using a single stream")
+        return resumable_download(url, dest_path, progress=progress, sha256=sha256, retries=retries,
+                                  base_delay=base_delay, max_delay=max_delay, timeout=timeout)
+    total, validator = probe
+    if total != size:
+        raise DownloadError(f"Download size mismatch for {url}: HEAD says {size}, Content-Range {total} bytes")
+
+    progress = tracked(progress)
+    partial = PartialDownload(dest_path)
+    parts = _load_segments(partial, url, size, validator)
+    if parts is None:
+        partial.discard()
+        parts = split_segments(size, segments)
+        with open(partial.part_path, 'wb') as f:
+            f.truncate(size)
+    lock = threading.Lock()
+    stop = threading.Event()
+    state = {'done': size - sum(part.remaining for part in parts)}
+    transfer_rate = transfer_rate or TransferRate()
+
+    def save():
+        partial.meta = {'url': url, 'size': size, 'validator': validator,
+                        'segments': [[part.start, part.end, part.pos] for part in parts]}
+        with open(partial.meta_path, 'w') as meta_file:
+            json.dump(partial.meta, meta_file)
+
+    def advance(part: Segment, length: int) -> None:
+        with lock:
+            part.pos += length
+            state['done'] += length
+            transfer_rate.update(state['done'])
+            done = state['done']
+        # outside the lock: a throttled report sleeps, which must not hold back the other segments and the hasher
+        if progress:
+            progress(done, size)
+
+    def fetch(part: Segment) -> None:
+        attempt = 0
+        while part.remaining > 0 and not stop.is_set():
+            headers = {'Range': f"bytes={part.pos}-{part.end}", 'If-Range': validator}
+            try:
+                with requests.get(url, headers=headers, stream=True, timeout=timeout) as response:
+                    if response.status_code >= 500:
+                        raise RetryableDownloadError(f"HTTP {response.status_code}")
+                    response.raise_for_status()
+                    if (response.status_code != 206 or
+                            not response.headers.get('Content-Range', '').startswith(f"bytes {part.pos}-")):
+                        # If-Range answered with the whole file: it changed since the download started
+                        raise DownloadError(f"{url} changed during the download")
+                    # unbuffered, so a byte counted in part.pos is visible to the hashing thread
+                    with open(partial.part_path, 'r+b', buffering=0) as f:
+                        f.seek(part.pos)
+                        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                            if stop.is_set():
+                                return
+                            chunk = chunk[:part.remaining]
+                            if chunk:
+                                f.write(chunk)
+                                advance(part, len(chunk))
+                if part.remaining > 0:
+                    raise RetryableDownloadError(f"connection closed with {part.remaining} bytes left")
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                    requests.exceptions.ChunkedEncodingError, RetryableDownloadError) as e:
+                attempt += 1
+                if attempt > retries:
+                    raise DownloadError(f"Segment {part.start}-{part.end} of {url} failed after {retries} retries: {e}") from e
+                delay = min(base_delay * 2 ** (attempt - 1), max_delay) * random.uniform(0.8, 1.2)
+                logging.warning(f"Segment {part.start}-{part.end} of {url} interrupted ({e}), "
+                                f"retry {attempt}/{retries} in {delay:.1f}s")
+                stop.wait(delay)
+
+    def contiguous() -> int:
+        for part in parts:
+            if part.remaining > 0:
+                return part.pos
+        return size
+
+    hasher = PrefixHasher(partial.part_path)
+    hashing_done = threading.Event()
+
+    def hash_prefix() -> None:
+        while not hashing_done.wait(0.5):
+            with lock:
+                end = contiguous()
+            hasher.update_to(end)
+
+    pending = [part for part in parts if part.remaining > 0]
+    logging.info(f"Downloading {url} in {len(parts)} segments, {len(pending)} to fetch, "
+                 f"{state['done']}/{size} bytes already on disk")
+    hash_thread = threading.Thread(target=hash_prefix, name="SegmentHasher", daemon=True)
+    hash_thread.start()
+    try:
+        with ThreadPoolExecutor(max_workers=len(pending) or 1, thread_name_prefix="Segment") as executor:
+            futures = [executor.submit(fetch, part) for part in pending]
+            finished, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in finished:
+                if future.exception() is not None:
+                    # the other segments stop at their next chunk
+                    stop.set()
+                    raise future.exception()
+    finally:
+        hashing_done.set()
+        hash_thread.join()
+        with lock:
+            save()
+
+    hasher.update_to(size)
+    logging.info(f"Fetched {url} on {len(pending)} connections, {transfer_rate.average() / 1048576:.2f} MB/s")
+    return finish_download(partial, url, hasher.sha256.hexdigest(), sha256)
+
+
+class PrefixHasher:
+    """Incremental SHA-256 of a file written out of order, fed with its prefix as that grows."""
+
+    def __init__(self, path: str):
+        self.path: str = path
+        self.sha256 = hashlib.sha256()
+        self.pos: int = 0
+
+    def update_to(self, end: int) -> None:
+        if end <= self.pos:
+            return
+        with open(self.path, 'rb') as f:
+            f.seek(self.pos)
+            while self.pos < end:
+                chunk = f.read(min(CHUNK_SIZE * 16, end - self.pos))
+                if not chunk:
+                    break
+                self.sha256.update(chunk)
+                self.pos += len(chunk)
+
+
+def _load_segments(partial: PartialDownload, url: str, size: int, validator):
+    """Return the segments of an interrupted segmented download of the same file, None otherwise."""
+    try:
+        with open(partial.meta_path, 'r') as f:
+            meta = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if (meta.get('url') != url or meta.get('size') != size or meta.get('validator') != validator or
+            not validator or not meta.get('segments') or not os.path.exists(partial.part_path) or
+            os.path.getsize(partial.part_path) != size):
+        return None
+    return [Segment(start, end, pos) for start, end, pos in meta['segments']]
+
+
+class HashingReader:
+    """File-like view of a streamed response body, hashing and counting the bytes tarfile reads from it."""
+
+    def __init__(self, response: requests.Response, progress=None):
+        self.raw = response.raw
+        self.total: int = int(response.headers.get('Content-Length', 0))
+        self.progress = progress
+        self.sha256 = hashlib.sha256()
+        self.done: int = 0
+
+    def read(self, size: int = -1) -> bytes:
+        try:
+            data = self.raw.read(None if size is None or size < 0 else size, decode_content=True)
+        except urllib3.exceptions.HTTPError as e:
+            # raw reads are not wrapped by requests, a dropped connection surfaces as a urllib3 error
+            raise DownloadError(f"Connection lost after {self.done} bytes: {e}") from e
+        if data:
+            self.sha256.update(data)
+            self.done += len(data)
+            if self.progress:
+                self.progress(self.done, self.total)
+        return data
+
+    def drain(self) -> None:
+        """Read what follows the end-of-archive marker so size and hash cover the whole body."""
+        while self.read(CHUNK_SIZE):
+            pass
+
+
+def stream_extract_tar(url: str, extract_to: str, progress=None, sha256: str = None, timeout=(10, 30)) -> str:
+    """
+    Extract a .tar.gz while it downloads, entries are written as they arrive instead of after the whole
+    archive hit the disk. Extraction goes to a staging folder inside extract_to, moved into place only
+    once the size and hash of the body are verified, a failed download leaves extract_to untouched.
+    :param sha256: expected hex digest of the archive, only logged when None
+    :return: hex digest of the archive
+    """
+    progress = tracked(progress)
+    staging = os.path.join(extract_to, f".extracting-{os.path.basename(url)}")
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    try:
+        with requests.get(url, stream=True, timeout=timeout) as response:
+            response.raise_for_status()
+            reader = HashingReader(response, progress)
+            with tarfile.open(fileobj=reader, mode='r|gz') as tar:
+                for member in tar:
+                    tar.extract(member, staging)
+            reader.drain()
+        if reader.total and reader.done != reader.total:
+            raise DownloadError(f"Download size mismatch for {url}: {reader.done} != {reader.total} bytes")
+        digest = reader.sha256.hexdigest()
+        if sha256 and digest != sha256.lower():
+            # not a transfer problem, downloading it again would not help
+            raise ValueError(f"SHA-256 mismatch for {url}: {digest} != {sha256}")
+        logging.info(f"Streamed {url} into {extract_to} ({reader.done} bytes, sha256 {digest})")
+        for name in os.listdir(staging):
+            target = os.path.join(extract_to, name)
+            if os.path.isdir(target) and not os.path.islink(target):
+                shutil.rmtree(target)
+            elif os.path.lexists(target):
+                os.remove(target)
+            os.replace(os.path.join(staging, name), target)
+        return digest
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
@@ -0,0 +1,144 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class HealthProbe:
+    def __init__(self, name: str, func, steady_interval: float, fast_interval: float, max_backoff: float,
+                 target_running=None, on_down=None):
+        self.name: str = name
+        self.func = func  # returns True when the target answered
+        self.steady_interval: float = steady_interval
+        self.fast_interval: float = fast_interval
+        self.max_backoff: float = max_backoff
+        self.target_running = target_running
+        self.on_down = on_down
+        self.next_run: float = 0
+        self.failures: int = 0
+        self.boost_started: float = 0
+        self.boost_until: float = 0
+        self.in_progress: bool = False
+        self.last_ok = None
+        self.last_duration: float = 0
+
+
+class HealthScheduler:
+    """
+    Single heap-based scheduler owning the health probes.
+    A probe runs every steady_interval while it succeeds, backs off exponentially up to max_backoff while it
+    fails or its target process is down, and runs every fast_interval after boost() until its first success.
+    Due probes are run on a small thread pool, a probe is never run twice at the same time.
+    """
+
+    def __init__(self, max_workers: int = 3):
+        self.probes: dict = {}
+        self.heap: list = []
+        self.counter = itertools.count()
+        self.condition = threading.Condition()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="HealthProbe")
+        self.running: bool = False
+        self.thread = None
+
+    def register(self, name: str, func, steady_interval: float = 10, fast_interval: float = 1,
+                 max_backoff: float = 30, target_running=None, on_down=None) -> None:
+        """
+        :param target_running: optional callable, the probe is skipped (and on_down called) while it returns False
+        :param on_down: optional callable resetting the probe state when the target is down
+        """
+        with self.condition:
+            self.probes[name] = HealthProbe(name, func, steady_interval, fast_interval, max_backoff,
+                                            target_running, on_down)
+            self._schedule(self.probes[name], time.monotonic())
+
+    def boost(self, name: str, window: float = 120) -> None:
+        """Poll fast right away, e.g. after a start request, until the first success or window seconds."""
+        with self.condition:
+            probe = self.probes.get(name)
+            if probe is None:
+                return
+            probe.boost_started = time.monotonic()
+            probe.boost_until = probe.boost_started + window
+            probe.failures = 0
+            self._schedule(probe, time.monotonic())
+
+    def poke(self, name: str) -> None:
+        """Run a probe as soon as possible, without changing its rate afterwards."""
+        with self.condition:
+            probe = self.probes.get(name)
+            if probe is not None:
+                self._schedule(probe, time.monotonic())
+
+    def start(self) -> None:
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="HealthScheduler", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _schedule(self, probe: HealthProbe, when: float) -> None:
+        # older heap entries of the probe are left in place and skipped when popped
+        probe.next_run = when
+        if not probe.in_progress:
+            heapq.heappush(self.heap, (when, next(self.counter), probe.name))
+            self.condition.notify()
+
+    def _run(self) -> None:
+        with self.condition:
+            while self.running:
+                if not self.heap:
+                    self.condition.wait()
+                    continue
+                when, _, name = self.heap[0]
+                delay = when - time.monotonic()
+                if delay > 0:
+                    self.condition.wait(delay)
+                    continue
+                heapq.heappop(self.heap)
+                probe = self.probes.get(name)
+                if probe is None or probe.in_progress or probe.next_run != when:
+                    continue
+                probe.in_progress = True
+                try:
+                    self.executor.submit(self._run_probe, probe)
+                except RuntimeError:
+                    # executor shut down
+                    return
+
+    def _run_probe(self, probe: HealthProbe) -> None:
+        start = time.monotonic()
+        ok = False
+        try:
+            if probe.target_running is not None and not probe.target_running():
+                if probe.on_down:
+                    probe.on_down()
+            else:
+                ok = bool(probe.func())
+        except Exception as e:
+            logging.error(f"HealthScheduler: probe {probe.name} failed: {e}")
+        now = time.monotonic()
+        with self.condition:
+            probe.in_progress = False
+            probe.last_duration = now - start
+            if ok:
+                if probe.boost_until:
+                    logging.info(f"HealthScheduler: {probe.name} ready {now - probe.boost_started:.1f}s after start")
+                probe.failures = 0
+                probe.boost_until = 0
+                interval = probe.steady_interval
+            elif now < probe.boost_until:
+                # the target was just started, it may not even be seen running yet
+                interval = probe.fast_interval
+            else:
+                probe.failures += 1
+                interval = min(probe.fast_interval * 2 ** probe.failures, probe.max_backoff)
+            probe.last_ok = ok
+            # a poke() or boost() received while running wins if it asked for an earlier run
+            when = min(probe.next_run, now + interval) if probe.next_run > start else now + interval
+            self._schedule(probe, when)
@@ -7,6 +7,9 @@ import zipfile
 import psutil
 import requests
 
+from utilities.download_util import DownloadError, expected_sha256, remove_digest_sidecar, resumable_download, \
+    stream_extract_tar
+
 logging.basicConfig(level=logging.DEBUG)
 
 
@@ -15,25 +18,24 @@ class UtilityHelper:
         pass
 
     # Shared by all 3 utilities
-    def download_file(self, url, tmp_path, final_path, extract_to, system, progress_attr, instance):
+    def download_file(self, url, tmp_path, final_path, extract_to, system, progress_attr, instance, sha256=None):
         logging.info(f"Starting download from {url}")
-        response = requests.get(url, stream=True, timeout=(10, 30))
-        response.raise_for_status()
-
-        remote_size = int(response.headers.get('Content-Length', 0))
-        with open(tmp_path, 'wb') as f:
-            bytes_downloaded = 0
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-                    bytes_downloaded += len(chunk)
-                    if progress_attr and instance:
-                        setattr(instance, progress_attr, (bytes_downloaded / remote_size) * 100)
-                        logging.debug(f"Downloaded {bytes_downloaded}/{remote_size} bytes")
-
-        if os.path.getsize(tmp_path) != remote_size:
-            os.remove(tmp_path)
-            raise ValueError("Download size mismatch")
+        sha256 = sha256 or expected_sha256(url)
+
+        def progress(bytes_downloaded, remote_size):
+            if progress_attr and instance and remote_size:
+                setattr(instance, progress_attr, (bytes_downloaded / remote_size) * 100)
+
+        if url.endswith(".tar.gz"):
+            try:
+                stream_extract_tar(url, extract_to, progress=progress, sha256=sha256)
+                return
+            except (requests.exceptions.RequestException, tarfile.TarError, EOFError, OSError, DownloadError) as e:
+                # nothing was moved into extract_to, retry through the resumable temp file
+                logging.warning(f"Streaming extract of {url} failed ({e}), falling back to a temp file download")
+
+        # an interrupted download is resumed from tmp_path.part on the next attempt
+        resumable_download(url, tmp_path, progress=progress, sha256=sha256)
         logging.info(f"File downloaded successfully to {tmp_path}")
 
         if url.endswith(".zip"):
@@ -49,21 +51,60 @@ class UtilityHelper:
         elif url.endswith(".dmg") and system == "Darwin":
             os.rename(tmp_path, final_path)
             logging.info(f"Renamed DMG file to {final_path}")
+        # the temp file is gone or renamed, its digest record is of no use
+        remove_digest_sidecar(tmp_path)
 
     # Shared by all 3 utilities
-    def terminate_processes(self, pids, name):
-        for pid in pids:
+    def terminate_processes(self, pids, name, timeout=10):
+        return self.terminate_process_groups({name: pids}, timeout=timeout)
+
+    def terminate_process_groups(self, groups, timeout=10, kill_timeout=5):
+        """
+        Terminate every PID at once and wait for all of them under a single deadline, the survivors
+        are then killed. Takes about as long as the slowest process, not the sum of all of them.
+        :param groups: {name: [pids]}
+        :return: {pid: "terminated" | "killed" | "not running" | "access denied" | "kill failed"}
+        """
+        report = {}
+        names = {}
+        procs = []
+        for name, pids in groups.items():
+            for pid in pids:
+                names[pid] = name
+                try:
+                    proc = psutil.Process(pid)
+                    proc.terminate()
+                    procs.append(proc)
+                except psutil.NoSuchProcess:
+                    report[pid] = "not running"
+                except psutil.AccessDenied:
+                    report[pid] = "access denied"
+
+        gone, alive = psutil.wait_procs(procs, timeout=timeout)
+        for proc in gone:
+            report[proc.pid] = "terminated"
+
+        killed = []
+        for proc in alive:
             try:
-                proc = psutil.Process(pid)
-                proc.terminate()
-                proc.wait(timeout=10)
-                logging.info(f"Process {name} PID {pid} terminated successfully")
-            except (psutil.NoSuchProcess, psutil.TimeoutExpired) as e:
-                if isinstance(e, psutil.TimeoutExpired):
-                    proc.kill()
-                    logging.warning(f"Process {name} PID {pid}: Timeout expired, killed process")
-                else:
-                    logging.warning(f"Process {name} PID {pid}: {str(e)}")
+                proc.kill()
+                killed.append(proc)
+            except psutil.NoSuchProcess:
+                report[proc.pid] = "terminated"
+            except psutil.AccessDenied:
+                report[proc.pid] = "kill failed"
+        gone, alive = psutil.wait_procs(killed, timeout=kill_timeout)
+        for proc in gone:
+            report[proc.pid] = "killed"
+        for proc in alive:
+            report[proc.pid] = "kill failed"
+
+        for pid, outcome in report.items():
+            if outcome == "terminated":
+                logging.info(f"Process {names[pid]} PID {pid} terminated successfully")
+            else:
+                logging.warning(f"Process {names[pid]} PID {pid}: {outcome}")
+        return report
 
     # Shared by BlockdxUtility and XliteUtility
     def handle_dmg(self, dmg_path, mount_path, action):
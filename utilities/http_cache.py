@@ -0,0 +1,114 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import NamedTuple
+
+import requests
+
+from utilities import global_variables
+
+INDEX_FILE = "http_cache.json"
+
+
+class CachedResponse(NamedTuple):
+    """Body of a cached URL, stale is True when it was served from disk without the server confirming it."""
+    content: bytes
+    path: str
+    status: str  # 'fresh' (200), 'not_modified' (304) or 'stale' (offline / server error)
+    fetched: float = 0
+
+    @property
+    def stale(self) -> bool:
+        return self.status == 'stale'
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8')
+
+
+class HTTPCache:
+    """
+    Conditional-request cache of remote files, bodies live at the path given by the caller and
+    ETag / Last-Modified of each URL are kept in an index next to them. A 304 is served from disk,
+    and so is a failed request when a copy exists, marked stale.
+    """
+
+    def __init__(self, folder: str, timeout=(5, 15)):
+        self.folder: str = folder
+        self.index_path: str = os.path.join(folder, INDEX_FILE)
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.lock = threading.Lock()
+        self.index: dict = self._load_index()
+
+    def get(self, url: str, path: str, offline: bool = False):
+        """
+        Return a CachedResponse, or None when the URL is unreachable and nothing is cached.
+        :param offline: only read the copy on disk, never touch the network
+        """
+        with self.lock:
+            meta = dict(self.index.get(url, {}))
+        cached = os.path.exists(path)
+        if offline:
+            return CachedResponse(self._read(path), path, 'stale', meta.get('fetched', 0)) if cached else None
+        headers = {}
+        if cached and meta.get('path') == path:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            return self._stale(url, path, meta, cached, e)
+
+        if response.status_code == 304 and cached:
+            self._update_index(url, dict(meta, fetched=time.time()))
+            logging.debug(f"HTTP-CACHE: not modified [{url}]")
+            return CachedResponse(self._read(path), path, 'not_modified', time.time())
+        if response.status_code == 200:
+            self._write(path, response.content)
+            self._update_index(url, {'path': path,
+                                     'etag': response.headers.get('ETag'),
+                                     'last_modified': response.headers.get('Last-Modified'),
+                                     'fetched': time.time()})
+            return CachedResponse(response.content, path, 'fresh', time.time())
+        return self._stale(url, path, meta, cached, f"HTTP {response.status_code}")
+
+    def _stale(self, url: str, path: str, meta: dict, cached: bool, error):
+        if not cached:
+            logging.error(f"HTTP-CACHE: failed to retrieve {url}: {error}")
+            return None
+        logging.warning(f"HTTP-CACHE: failed to retrieve {url}: {error}, serving stale copy [{path}]")
+        return CachedResponse(self._read(path), path, 'stale', meta.get('fetched', 0))
+
+    def _read(self, path: str) -> bytes:
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def _write(self, path: str, content: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def _load_index(self) -> dict:
+        try:
+            with open(self.index_path, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _update_index(self, url: str, meta: dict) -> None:
+        with self.lock:
+            self.index[url] = meta
+            try:
+                self._write(self.index_path, json.dumps(self.index, indent=4).encode())
+            except OSError as e:
+                logging.error(f"HTTP-CACHE: error saving {self.index_path}: {e}")
+
+
+http_cache = HTTPCache(os.path.join(global_variables.aio_folder, "xb_conf"))
@@ -6,7 +6,8 @@ import subprocess
 import sys
 from pathlib import Path
 
-import requests
+from utilities.download_manager import download_manager
+from utilities.download_util import resumable_download
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 
@@ -32,11 +33,7 @@ class PortablePythonInstaller:
 
     def download(self, url: str, dest: Path):
         logging.info(f"Downloading {url}")
-        r = requests.get(url, stream=True)
-        r.raise_for_status()
-        with open(dest, "wb") as f:
-            for chunk in r.iter_content(8192):
-                f.write(chunk)
+        download_manager.run("miniforge", lambda: resumable_download(url, str(dest)), url)
         logging.info(f"Saved installer to {dest}")
 
     def install(self):
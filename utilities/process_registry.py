@@ -0,0 +1,94 @@
+import logging
+import threading
+import time
+
+import psutil
+
+from utilities import utils
+
+
+class ProcessRegistry:
+    """
+    Keeps track of the PIDs of the monitored binaries between checks.
+
+    Known PIDs are re-validated cheaply (pid + create_time, so a reused PID is detected), a full
+    process_iter() walk only happens when a tracked process disappeared, when a start was requested,
+    or every full_scan_interval seconds to pick up binaries started outside the monitor.
+    """
+
+    def __init__(self, full_scan_interval: float = 60):
+        self.target_names: list = list(utils.get_process_target_names())
+        self.full_scan_interval: float = full_scan_interval
+        self.tracked: dict = {}  # pid -> (name, create_time)
+        self.rescan_requested: bool = True
+        self.rescan_until: float = 0
+        self.last_full_scan: float = 0
+        self.lock = threading.Lock()
+
+    def request_rescan(self, window: float = 0) -> None:
+        """
+        Force a full scan on next check, called when a binary start was requested.
+        :param window: keep doing full scans for this many seconds, apps like XLite spawn their daemon late.
+        """
+        self.rescan_requested = True
+        self.rescan_until = max(self.rescan_until, time.monotonic() + window)
+
+    def adopt(self, pid: int) -> None:
+        """Track a PID we know about (e.g. a process we just launched) without scanning."""
+        try:
+            proc = psutil.Process(pid)
+            name = proc.name()
+            if name in self.target_names:
+                with self.lock:
+                    self.tracked[pid] = (name, proc.create_time())
+        except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
+            logging.debug(f"ProcessRegistry: cannot adopt PID {pid}: {e}")
+
+    def forget(self, pid: int) -> None:
+        """Drop a PID known to have exited, without triggering a full scan."""
+        with self.lock:
+            self.tracked.pop(pid, None)
+
+    def check(self) -> tuple:
+        """Return the (blocknet, blockdx, xlite, xlite_daemon) PID lists."""
+        with self.lock:
+            now = time.monotonic()
+            scan_due = now - self.last_full_scan >= self.full_scan_interval or now < self.rescan_until
+            if self.rescan_requested or scan_due or not self._revalidate():
+                self._full_scan()
+            return self._result()
+
+    def _revalidate(self) -> bool:
+        """Check the tracked PIDs are still alive, returns False if one of them disappeared."""
+        all_alive = True
+        for pid, (name, create_time) in list(self.tracked.items()):
+            try:
+                proc = psutil.Process(pid)
+                if proc.create_time() != create_time:
+                    # PID was reused by another process
+                    raise psutil.NoSuchProcess(pid)
+                if utils.handle_process(pid, name, proc.status(), name) is None:
+                    raise psutil.NoSuchProcess(pid)
+            except psutil.NoSuchProcess:
+                del self.tracked[pid]
+                all_alive = False
+            except psutil.AccessDenied:
+                pass
+        return all_alive
+
+    def _full_scan(self) -> None:
+        tracked = {}
+        for proc in psutil.process_iter(['pid', 'name', 'status', 'create_time']):
+            pid = proc.info['pid']
+            name = proc.info['name']
+            if name not in self.target_names:
+                continue
+            if utils.handle_process(pid, name, proc.info['status'], name) is not None:
+                tracked[pid] = (name, proc.info['create_time'])
+        self.tracked = tracked
+        self.rescan_requested = False
+        self.last_full_scan = time.monotonic()
+
+    def _result(self) -> tuple:
+        return tuple([pid for pid, (name, _) in self.tracked.items() if name == target_name]
+                     for target_name in self.target_names)
@@ -0,0 +1,99 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import NamedTuple
+
+from utilities.process_registry import ProcessRegistry
+from utilities.process_telemetry import ProcessTelemetry
+
+
+class ProcessSnapshot(NamedTuple):
+    """Immutable result of one process sample, the GUI only reads these."""
+    blocknet: tuple = ()
+    blockdx: tuple = ()
+    xlite: tuple = ()
+    xlite_daemon: tuple = ()
+    timestamp: float = 0
+    sample_duration: float = 0
+
+    def groups(self) -> dict:
+        """Map each app name to its PIDs."""
+        return {'blocknet': self.blocknet,
+                'blockdx': self.blockdx,
+                'xlite': self.xlite,
+                'xlite_daemon': self.xlite_daemon}
+
+
+class ProcessSampler:
+    """
+    Samples process status on a background thread and publishes a ProcessSnapshot.
+    A slow /proc walk or a zombie wait() then never blocks the Tk main loop.
+    """
+
+    def __init__(self, registry: ProcessRegistry, telemetry: ProcessTelemetry = None, interval: float = 5,
+                 slow_sample_warning: float = 1, summary_interval: float = 300):
+        self.registry: ProcessRegistry = registry
+        self.telemetry: ProcessTelemetry = telemetry
+        self.interval: float = interval
+        self.slow_sample_warning: float = slow_sample_warning
+        self.snapshot: ProcessSnapshot = ProcessSnapshot()
+        self.sample_durations: deque = deque(maxlen=120)
+        self.summary_interval: float = summary_interval
+        self.last_summary: float = time.monotonic()
+        self.running: bool = True
+        self.wakeup = threading.Event()
+        self.thread = None
+
+    def start(self) -> None:
+        self.thread = threading.Thread(target=self._run, name="ProcessSampler", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.running = False
+        self.wakeup.set()
+
+    def request_sample(self) -> None:
+        """Wake the sampler thread to publish a fresh snapshot without waiting for the interval."""
+        self.wakeup.set()
+
+    def _run(self) -> None:
+        interval = min(self.interval, self.telemetry.interval) if self.telemetry else self.interval
+        while self.running:
+            self.sample()
+            if self.telemetry:
+                try:
+                    self.telemetry.maybe_sample(self.snapshot.groups())
+                except Exception as e:
+                    logging.error(f"ProcessSampler: telemetry sample failed: {e}")
+            self.wakeup.wait(interval)
+            self.wakeup.clear()
+
+    def log_summary(self) -> None:
+        """Log the cost of the recent samples, to see how expensive scans get on a loaded machine."""
+        self.last_summary = time.monotonic()
+        durations = sorted(self.sample_durations)
+        if not durations:
+            return
+        logging.info(f"ProcessSampler: {len(durations)} samples, median {durations[len(durations) // 2] * 1000:.1f}ms, "
+                     f"max {durations[-1] * 1000:.1f}ms")
+
+    def sample(self) -> None:
+        start = time.perf_counter()
+        try:
+            blocknet, blockdx, xlite, xlite_daemon = self.registry.check()
+        except Exception as e:
+            logging.error(f"ProcessSampler: process check failed: {e}")
+            return
+        duration = time.perf_counter() - start
+        self.sample_durations.append(duration)
+        if duration >= self.slow_sample_warning:
+            logging.warning(f"ProcessSampler: slow process sample, took {duration:.2f}s")
+        if time.monotonic() - self.last_summary >= self.summary_interval:
+            self.log_summary()
+        self.snapshot = ProcessSnapshot(blocknet=tuple(blocknet),
+                                        blockdx=tuple(blockdx),
+                                        xlite=tuple(xlite),
+                                        xlite_daemon=tuple(xlite_daemon),
+                                        timestamp=time.time(),
+                                        sample_duration=duration)
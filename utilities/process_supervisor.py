@@ -0,0 +1,185 @@
+import logging
+import random
+import threading
+import time
+from collections import deque
+
+
+class ChildExitWatcher:
+    """
+    Waits on the Popen handles of the processes the monitor launched itself, and notifies listeners
+    as soon as one of them exits, with its exit code. Processes started outside the monitor are still
+    only found by the process registry scans.
+    """
+
+    def __init__(self):
+        self.start_listeners: list = []
+        self.exit_listeners: list = []
+        self.watched: dict = {}  # pid -> name
+        self.lock = threading.Lock()
+
+    def add_start_listener(self, callback) -> None:
+        """callback(name, pid) is called when a new child is watched."""
+        self.start_listeners.append(callback)
+
+    def add_exit_listener(self, callback) -> None:
+        """callback(name, pid, returncode) is called from the waiter thread when a child exits."""
+        self.exit_listeners.append(callback)
+
+    def is_watched(self, pid: int) -> bool:
+        with self.lock:
+            return pid in self.watched
+
+    def watch(self, name: str, process) -> None:
+        if process is None or process.pid is None:
+            return
+        with self.lock:
+            self.watched[process.pid] = name
+        self._notify(self.start_listeners, name, process.pid)
+        thread = threading.Thread(target=self._wait, args=(name, process), name=f"ChildExitWatcher-{name}-{process.pid}",
+                                  daemon=True)
+        thread.start()
+
+    def _wait(self, name: str, process) -> None:
+        try:
+            returncode = process.wait()
+        except Exception as e:
+            logging.error(f"ChildExitWatcher: error waiting on {name} PID {process.pid}: {e}")
+            return
+        with self.lock:
+            self.watched.pop(process.pid, None)
+        logging.info(f"ChildExitWatcher: {name} PID {process.pid} exited with code {returncode}")
+        self._notify(self.exit_listeners, name, process.pid, returncode)
+
+    def _notify(self, listeners: list, *args) -> None:
+        for callback in list(listeners):
+            try:
+                callback(*args)
+            except Exception as e:
+                logging.error(f"ChildExitWatcher: listener {callback} failed: {e}")
+
+
+class SupervisedProcess:
+    def __init__(self, name: str, start_func, enabled: bool = False, is_running=None):
+        self.name: str = name
+        self.start_func = start_func
+        self.is_running = is_running
+        self.enabled: bool = enabled
+        self.exit_expected: bool = False
+        self.crash_times: deque = deque()
+        self.crashes: int = 0
+        self.restarts: int = 0
+        self.crash_loops: int = 0
+        self.given_up: bool = False
+        self.last_restart_latency = None
+        self.timer = None
+
+
+class RestartSupervisor:
+    """
+    Restarts supervised processes that exit without being asked to, with exponential backoff and jitter.
+    After max_restarts crashes within window seconds it is considered a crash loop and the supervisor
+    gives up until the process is started again by hand.
+    """
+
+    def __init__(self, base_delay: float = 2, max_delay: float = 120, jitter: float = 0.2, max_restarts: int = 5,
+                 window: float = 600):
+        self.base_delay: float = base_delay
+        self.max_delay: float = max_delay
+        self.jitter: float = jitter
+        self.max_restarts: int = max_restarts
+        self.window: float = window
+        self.services: dict = {}
+        self.lock = threading.Lock()
+
+    def register(self, name: str, start_func, enabled: bool = False, is_running=None) -> None:
+        """:param is_running: optional callable, a pending restart is skipped when it returns True"""
+        self.services[name] = SupervisedProcess(name, start_func, enabled, is_running)
+
+    def set_enabled(self, name: str, enabled: bool) -> None:
+        service = self.services[name]
+        service.enabled = enabled
+        if not enabled:
+            self._cancel_timer(service)
+
+    def expect_exit(self, name: str) -> None:
+        """Called before an intentional stop, so the exit is not taken for a crash."""
+        service = self.services[name]
+        service.exit_expected = True
+        self._cancel_timer(service)
+
+    def manual_start(self, name: str) -> None:
+        """A start requested by the user clears a previous give up and the crash history."""
+        service = self.services[name]
+        with self.lock:
+            self._cancel_timer(service)
+            service.exit_expected = False
+            service.given_up = False
+            service.crash_times.clear()
+
+    def on_exit(self, name: str, returncode=None) -> None:
+        service = self.services.get(name)
+        if service is None:
+            return
+        with self.lock:
+            if service.exit_expected or not service.enabled or returncode == 0:
+                service.exit_expected = False
+                return
+            if service.given_up or service.timer:
+                return
+            now = time.monotonic()
+            service.crashes += 1
+            service.crash_times.append(now)
+            while service.crash_times and now - service.crash_times[0] > self.window:
+                service.crash_times.popleft()
+            if len(service.crash_times) > self.max_restarts:
+                service.given_up = True
+                service.crash_loops += 1
+                logging.error(f"RestartSupervisor: {name} crashed {len(service.crash_times)} times in "
+                              f"{int(self.window)}s, giving up")
+                return
+            delay = min(self.base_delay * 2 ** (len(service.crash_times) - 1), self.max_delay)
+            delay *= 1 + random.uniform(-self.jitter, self.jitter)
+            logging.warning(f"RestartSupervisor: {name} exited with code {returncode}, restarting in {delay:.1f}s")
+            service.timer = threading.Timer(delay, self._restart, args=(service, now))
+            service.timer.daemon = True
+            service.timer.start()
+
+    def status(self, name: str):
+        return self.services.get(name)
+
+    def _restart(self, service: SupervisedProcess, crash_time: float) -> None:
+        service.timer = None
+        if not service.enabled or service.exit_expected:
+            return
+        if service.is_running is not None and service.is_running():
+            logging.info(f"RestartSupervisor: {service.name} already running, restart skipped")
+            return
+        try:
+            service.start_func()
+            service.restarts += 1
+            service.last_restart_latency = time.monotonic() - crash_time
+            logging.info(f"RestartSupervisor: {service.name} restarted, "
+                         f"{service.last_restart_latency:.1f}s after the crash")
+        except Exception as e:
+            logging.error(f"RestartSupervisor: failed to restart {service.name}: {e}")
+
+    def _cancel_timer(self, service: SupervisedProcess) -> None:
+        if service.timer:
+            service.timer.cancel()
+            service.timer = None
+
+
+def format_supervisor_status(service: SupervisedProcess) -> str:
+    """Format restart counters of a supervised process for the GUI panels."""
+    if service is None or not (service.enabled or service.crashes):
+        return ""
+    text = f"Restarts {service.restarts} | Crashes {service.crashes} | Crash loops {service.crash_loops}"
+    if service.last_restart_latency is not None:
+        text += f" | Last restart {service.last_restart_latency:.1f}s"
+    if service.given_up:
+        text += " | Gave up"
+    return text
+
+
+child_exit_watcher = ChildExitWatcher()
@@ -0,0 +1,189 @@
+import logging
+import threading
+import time
+from array import array
+
+import psutil
+
+METRICS = ('cpu_percent', 'rss', 'io_read_bytes', 'io_write_bytes', 'num_fds', 'num_threads', 'num_processes')
+# Electron apps, their renderer/GPU/utility children are summed with the main process
+TREE_APPS = ('blockdx', 'xlite')
+
+
+class RingBuffer:
+    """Fixed-size array-backed ring buffer of floats, memory use stays flat whatever the uptime."""
+
+    def __init__(self, size: int):
+        self.size: int = size
+        self.data: array = array('d', [0.0] * size)
+        self.index: int = 0
+        self.count: int = 0
+
+    def append(self, value: float) -> None:
+        self.data[self.index] = value
+        self.index = (self.index + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    def values(self) -> list:
+        """Return the stored values, oldest first."""
+        if self.count < self.size:
+            return self.data[:self.count].tolist()
+        return (self.data[self.index:] + self.data[:self.index]).tolist()
+
+    def latest(self):
+        if not self.count:
+            return None
+        return self.data[(self.index - 1) % self.size]
+
+    def __len__(self) -> int:
+        return self.count
+
+
+class ProcessTelemetry:
+    """
+    Collects CPU%, RSS, IO bytes, open fds and thread counts for the managed PIDs.
+    Each app keeps one ring buffer per metric, 'latest' holds the last sample (None when not running).
+    For TREE_APPS the whole process tree is summed, and children left behind by a dead parent are
+    reported in 'orphans'.
+    """
+
+    def __init__(self, interval: float = 5, history: int = 720):
+        self.interval: float = interval
+        self.history: int = history
+        self.series: dict = {}  # app name -> {metric: RingBuffer}
+        self.timestamps: dict = {}  # app name -> RingBuffer
+        self.latest: dict = {}  # app name -> {metric: value} or None
+        self.procs: dict = {}  # pid -> psutil.Process, kept so cpu_percent() has a reference point
+        self.known_descendants: dict = {}  # app name -> {pid: create_time} seen on last tick
+        self.orphans: dict = {}  # app name -> {pid: create_time}
+        self.last_sample: float = 0
+        self.lock = threading.Lock()
+
+    def maybe_sample(self, groups: dict) -> None:
+        """Sample if the interval elapsed, groups maps an app name to its PIDs."""
+        if time.monotonic() - self.last_sample >= self.interval:
+            self.sample(groups)
+
+    def sample(self, groups: dict) -> None:
+        self.last_sample = time.monotonic()
+        alive_pids = set()
+        # walk each tree once per tick, every metric then reads from the same pid list
+        monitored = {pid for pids in groups.values() for pid in pids}
+        trees = {name: self._walk_tree(groups[name], monitored) for name in TREE_APPS if name in groups}
+        self._detect_orphans(trees)
+        for name, pids in groups.items():
+            stats = self._sample_pids(list(pids) + list(trees.get(name, {})), alive_pids)
+            with self.lock:
+                self.latest[name] = stats
+                if stats is None:
+                    continue
+                if name not in self.series:
+                    self.series[name] = {metric: RingBuffer(self.history) for metric in METRICS}
+                    self.timestamps[name] = RingBuffer(self.history)
+                for metric in METRICS:
+                    self.series[name][metric].append(stats[metric])
+                self.timestamps[name].append(time.time())
+        # drop cached Process objects of exited PIDs
+        for pid in list(self.procs):
+            if pid not in alive_pids:
+                del self.procs[pid]
+
+    def get_series(self, name: str, metric: str) -> list:
+        with self.lock:
+            if name not in self.series:
+                return []
+            return self.series[name][metric].values()
+
+    def _walk_tree(self, roots, exclude: set) -> dict:
+        """Return {pid: create_time} of all descendants of roots, minus PIDs monitored on their own."""
+        descendants = {}
+        for root in roots:
+            try:
+                for child in psutil.Process(root).children(recursive=True):
+                    if child.pid not in exclude:
+                        descendants[child.pid] = child.create_time()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return descendants
+
+    def _detect_orphans(self, trees: dict) -> None:
+        for name, current in trees.items():
+            candidates = dict(self.orphans.get(name, {}))
+            for pid, create_time in self.known_descendants.get(name, {}).items():
+                if pid not in current:
+                    candidates[pid] = create_time
+            orphans = {}
+            for pid, create_time in candidates.items():
+                if pid in current:
+                    continue
+                try:
+                    if psutil.Process(pid).create_time() == create_time:
+                        orphans[pid] = create_time
+                        if pid not in self.orphans.get(name, {}):
+                            logging.warning(f"ProcessTelemetry: {name} child PID {pid} left behind by its parent")
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+            with self.lock:
+                self.orphans[name] = orphans
+            self.known_descendants[name] = current
+
+    def _get_process(self, pid: int):
+        proc = self.procs.get(pid)
+        if proc is None or not proc.is_running():
+            proc = psutil.Process(pid)
+            proc.cpu_percent(None)  # first call only sets the reference point
+            self.procs[pid] = proc
+        return proc
+
+    def _sample_pids(self, pids, alive_pids: set):
+        if not pids:
+            return None
+        stats = {metric: 0.0 for metric in METRICS}
+        found = False
+        for pid in pids:
+            try:
+                proc = self._get_process(pid)
+                with proc.oneshot():
+                    stats['cpu_percent'] += proc.cpu_percent(None)
+                    stats['rss'] += proc.memory_info().rss
+                    stats['num_threads'] += proc.num_threads()
+                    stats['num_fds'] += proc.num_handles() if psutil.WINDOWS else proc.num_fds()
+                    if hasattr(proc, 'io_counters'):
+                        io = proc.io_counters()
+                        stats['io_read_bytes'] += io.read_bytes
+                        stats['io_write_bytes'] += io.write_bytes
+                stats['num_processes'] += 1
+                alive_pids.add(pid)
+                found = True
+            except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                continue
+            except psutil.AccessDenied as e:
+                alive_pids.add(pid)
+                logging.debug(f"ProcessTelemetry: access denied on PID {pid}: {e}")
+        return stats if found else None
+
+
+def format_telemetry(stats, prefix: str = "") -> str:
+    """Format one telemetry sample for the GUI panels."""
+    if not stats:
+        return ""
+    text = (f"{prefix}CPU {stats['cpu_percent']:.1f}% | RAM {format_bytes(stats['rss'])} | "
+            f"IO R {format_bytes(stats['io_read_bytes'])} W {format_bytes(stats['io_write_bytes'])} | "
+            f"FDs {int(stats['num_fds'])} | Threads {int(stats['num_threads'])}")
+    if stats['num_processes'] > 1:
+        text += f" | Procs {int(stats['num_processes'])}"
+    return text
+
+
+def format_orphans(orphans, prefix: str = "") -> str:
+    if not orphans:
+        return ""
+    return f"{prefix}{len(orphans)} orphaned subprocess(es): {', '.join(str(pid) for pid in sorted(orphans))}"
+
+
+def format_bytes(value: float) -> str:
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if value < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} TB"
@@ -0,0 +1,269 @@
+import base64
+import itertools
+import json
+import logging
+import threading
+import time
+from typing import NamedTuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# (connect, read) timeouts in seconds, long xbridge calls get a bigger read budget than a ping
+DEFAULT_RPC_TIMEOUT = (3, 15)
+RPC_METHOD_TIMEOUTS = {
+    'getinfo': (2, 5),
+    'getnetworkinfo': (2, 5),
+    'getblockcount': (2, 5),
+    'getbestblockhash': (2, 5),
+    'getblockchaininfo': (2, 10),
+    'dxGetNetworkWallets': (3, 30),
+    'dxloadxbridgeConf': (3, 30),
+    'dxGetOrders': (3, 60),
+    'dxGetMyOrders': (3, 60),
+}
+
+
+# read-only methods whose answers may be reused for ttl seconds, anything else always goes to the daemon
+RPC_CACHE_TTLS = {
+    'getinfo': 2,
+    'getnetworkinfo': 2,
+    'getblockcount': 2,
+    'getbestblockhash': 2,
+    'getblockchaininfo': 5,
+    'dxGetNetworkWallets': 10,
+}
+# calls that change daemon state, the cached reads of that endpoint are dropped after them
+RPC_WRITE_METHODS = ('dxloadxbridgeConf',)
+
+
+def rpc_timeout(method) -> tuple:
+    return RPC_METHOD_TIMEOUTS.get(method, DEFAULT_RPC_TIMEOUT)
+
+
+class RPCResponseCache:
+    """
+    TTL cache of RPC reads keyed by (endpoint, method, params), with single-flight coalescing:
+    concurrent identical calls share one request in flight and all get its result.
+    Only answers of methods listed in ttls are cached, failed calls (None) are never cached.
+    """
+
+    def __init__(self, ttls: dict = None):
+        self.ttls: dict = RPC_CACHE_TTLS if ttls is None else ttls
+        self.entries: dict = {}  # key -> (expires, result)
+        self.in_flight: dict = {}  # key -> [Event, result]
+        self.hits: int = 0
+        self.misses: int = 0
+        self.coalesced: int = 0
+        self.lock = threading.Lock()
+
+    def is_cacheable(self, method) -> bool:
+        return method in self.ttls
+
+    def get_or_call(self, url: str, method, params, call):
+        key = (url, method, json.dumps(params, sort_keys=True))
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+            flight = self.in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.in_flight[key] = [threading.Event(), None]
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            flight[0].wait()
+            return flight[1]
+        result = None
+        try:
+            result = call()
+        finally:
+            with self.lock:
+                # a cancel() while in flight removed our marker, do not store a result of the old generation
+                if result is not None and self.in_flight.get(key) is flight:
+                    self.entries[key] = (time.monotonic() + self.ttls[method], result)
+                if self.in_flight.get(key) is flight:
+                    del self.in_flight[key]
+            flight[1] = result
+            flight[0].set()
+        return result
+
+    def invalidate(self, url: str = None) -> None:
+        """Drop cached answers of one endpoint, or of all of them."""
+        with self.lock:
+            for store in (self.entries, self.in_flight):
+                for key in [key for key in store if url is None or key[0] == url]:
+                    del store[key]
+
+
+rpc_cache = RPCResponseCache()
+
+
+class RPCCancelledError(Exception):
+    """Raised when a call was cancelled while in flight, or the transport was shut down."""
+    pass
+
+
+class RPCTransport:
+    """
+    Keep-alive HTTP transport shared by the RPC clients.
+    One pooled requests.Session per endpoint, so polling does not redo a TCP handshake on every call.
+    """
+
+    def __init__(self, pool_maxsize: int = 4):
+        self.pool_maxsize: int = pool_maxsize
+        self.sessions: dict = {}
+        self.generations: dict = {}  # url -> cancel counter, a call started before a cancel() is dropped
+        self.closed: bool = False
+        self.lock = threading.Lock()
+
+    def get_session(self, url: str) -> requests.Session:
+        with self.lock:
+            session = self.sessions.get(url)
+            if session is None:
+                session = requests.Session()
+                session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize))
+                self.sessions[url] = session
+            return session
+
+    def post(self, url: str, headers: dict, payload, timeout=DEFAULT_RPC_TIMEOUT) -> requests.Response:
+        if self.closed:
+            raise RPCCancelledError("RPC transport is shut down")
+        generation = self.generations.get(url, 0)
+        response = self.get_session(url).post(url, json=payload, headers=headers, timeout=timeout)
+        if self.closed or self.generations.get(url, 0) != generation:
+            raise RPCCancelledError(f"RPC call to {url} was cancelled")
+        return response
+
+    def cancel(self, url: str = None) -> None:
+        """
+        Cancel the in-flight calls of one endpoint, or of all of them: their results are dropped and
+        the pooled connections closed. A call stuck on a read is still bounded by its timeout.
+        """
+        with self.lock:
+            urls = [url] if url else list(self.sessions)
+            for key in urls:
+                self.generations[key] = self.generations.get(key, 0) + 1
+                session = self.sessions.pop(key, None)
+                if session:
+                    session.close()
+
+    def shutdown(self) -> None:
+        self.closed = True
+        self.cancel()
+
+
+rpc_transport = RPCTransport()
+
+
+class RPCCallResult(NamedTuple):
+    """Outcome of one call of a batch, error is None on success."""
+    method: str
+    result: object = None
+    error: object = None
+
+
+class JSONRPCClient:
+    """Base JSON-RPC client, BlocknetRPCClient and XliteRPCClient sit on the shared rpc_transport."""
+
+    def __init__(self, rpc_user, rpc_password, rpc_port, transport: RPCTransport = None,
+                 cache: RPCResponseCache = None):
+        self.rpc_user = rpc_user
+        self.rpc_password = rpc_password
+        self.rpc_port = rpc_port
+        self.url = f"http://localhost:{self.rpc_port}"
+        token = base64.b64encode(f"{self.rpc_user}:{self.rpc_password}".encode()).decode()
+        self.headers = {'content-type': 'application/json', 'Authorization': f"Basic {token}"}
+        self.transport: RPCTransport = transport or rpc_transport
+        self.cache: RPCResponseCache = cache or rpc_cache
+        self.request_ids = itertools.count(1)
+
+    def build_request(self, method, params=None) -> dict:
+        return {
+            "jsonrpc": "2.0",
+            "method": method,
+            "params": params if params is not None else [],
+            "id": next(self.request_ids),
+        }
+
+    def cancel(self) -> None:
+        """Cancel the in-flight calls of this client, e.g. when the data dir changes."""
+        self.cache.invalidate(self.url)
+        self.transport.cancel(self.url)
+
+    def send_rpc_request(self, method=None, params=None, timeout=None):
+        """
+        Reads listed in RPC_CACHE_TTLS are served from the shared cache, write calls drop it.
+        :param timeout: (connect, read) seconds, defaults to the method budget from RPC_METHOD_TIMEOUTS
+        """
+        if self.cache.is_cacheable(method):
+            return self.cache.get_or_call(self.url, method, params,
+                                          lambda: self._send_rpc_request(method, params, timeout))
+        result = self._send_rpc_request(method, params, timeout)
+        if method in RPC_WRITE_METHODS:
+            self.cache.invalidate(self.url)
+        return result
+
+    def _send_rpc_request(self, method, params, timeout):
+        data = self.build_request(method, params)
+        try:
+            response = self.transport.post(self.url, self.headers, data, timeout=timeout or rpc_timeout(method))
+            if response.status_code != 200:
+                return None
+
+            json_answer = response.json()
+            if 'result' in json_answer:
+                return json_answer['result']
+            else:
+                logging.error(f"No result in json: {json_answer}")
+        except requests.RequestException as e:
+            return None
+        except RPCCancelledError as e:
+            logging.debug(f"{method}: {e}")
+            return None
+        except Exception as ex:
+            logging.exception(f"An unexpected error occurred while sending RPC request: {ex}")
+            return None
+
+    def batch(self, calls, timeout=None) -> list:
+        """
+        Send several calls in one JSON-RPC batch round trip.
+        :param calls: list of method names or (method, params) tuples
+        :param timeout: (connect, read) seconds, defaults to the largest budget of the batched methods
+        :return: list of RPCCallResult, in the same order as calls
+        """
+        requests_data = []
+        for call in calls:
+            method, params = (call, None) if isinstance(call, str) else call
+            requests_data.append(self.build_request(method, params))
+        methods = {data['id']: data['method'] for data in requests_data}
+        if timeout is None:
+            timeout = max((rpc_timeout(method) for method in methods.values()), key=lambda t: t[1],
+                          default=DEFAULT_RPC_TIMEOUT)
+        try:
+            response = self.transport.post(self.url, self.headers, requests_data, timeout=timeout)
+            answers = response.json()
+        except (requests.RequestException, RPCCancelledError) as e:
+            return [RPCCallResult(method, error=str(e)) for method in methods.values()]
+        except ValueError as e:
+            return [RPCCallResult(method, error=f"HTTP {response.status_code}: {e}") for method in methods.values()]
+
+        if not isinstance(answers, list):
+            # a server rejecting the whole batch answers with a single error object
+            error = answers.get('error') if isinstance(answers, dict) else answers
+            return [RPCCallResult(method, error=error) for method in methods.values()]
+
+        by_id = {answer.get('id'): answer for answer in answers if isinstance(answer, dict)}
+        results = []
+        for request_id, method in methods.items():
+            answer = by_id.get(request_id)
+            if answer is None:
+                results.append(RPCCallResult(method, error="No answer in batch response"))
+            elif answer.get('error'):
+                results.append(RPCCallResult(method, error=answer['error']))
+            else:
+                results.append(RPCCallResult(method, result=answer.get('result')))
+        return results
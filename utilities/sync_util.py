@@ -0,0 +1,132 @@
+import json
+import logging
+import os
+import time
+
+from utilities import global_variables
+from utilities.process_telemetry import RingBuffer
+
+SYNC_HISTORY_FILE = "sync_history.json"
+
+
+class SyncProgress:
+    """
+    Chain sync progress of Blocknet Core from getblockchaininfo samples.
+    The blocks/s rate is smoothed over the samples kept in ring buffers, the ETA is derived from it.
+    A run starts with the first sample after Core came up, time-to-synced of runs that had to sync
+    is appended to sync_history.json in the AIO folder.
+    """
+
+    def __init__(self, window: int = 30, history_path: str = None, history_size: int = 50):
+        self.heights: RingBuffer = RingBuffer(window)
+        self.times: RingBuffer = RingBuffer(window)
+        self.history_path: str = history_path or os.path.join(global_variables.aio_folder, SYNC_HISTORY_FILE)
+        self.history_size: int = history_size
+        self.bootstrap_applied: bool = False  # set when a bootstrap was extracted, tags the next run
+        self.reset()
+
+    def reset(self) -> None:
+        """Called when Core is down, the next sample starts a new run."""
+        self.blocks = None
+        self.headers = None
+        self.verification_progress = None
+        self.synced: bool = False
+        self.heights = RingBuffer(self.heights.size)
+        self.times = RingBuffer(self.times.size)
+        self.run_started = None
+        self.run_start_height = None
+        self.run_needed_sync: bool = False
+        self.time_to_synced = None
+
+    def update(self, info: dict) -> None:
+        now = time.monotonic()
+        self.blocks = info.get('blocks')
+        self.headers = info.get('headers')
+        self.verification_progress = info.get('verificationprogress')
+        if self.blocks is None or self.headers is None:
+            return
+        self.heights.append(self.blocks)
+        self.times.append(now)
+        synced = self.blocks >= self.headers and not info.get('initialblockdownload', False)
+        if self.run_started is None:
+            self.run_started = now
+            self.run_start_height = self.blocks
+            self.run_needed_sync = not synced
+        if synced and not self.synced and self.run_needed_sync:
+            self.time_to_synced = now - self.run_started
+            logging.info(f"BLOCKNET: synced {self.run_start_height} -> {self.blocks} in {self.time_to_synced:.0f}s")
+            self.record_run()
+        self.synced = synced
+
+    def rate(self):
+        """Smoothed blocks per second over the sample window, None until two samples are known."""
+        if len(self.times) < 2:
+            return None
+        heights = self.heights.values()
+        times = self.times.values()
+        elapsed = times[-1] - times[0]
+        if elapsed <= 0:
+            return None
+        return max(heights[-1] - heights[0], 0) / elapsed
+
+    def eta(self):
+        """Seconds left to reach the known headers, None while unknown."""
+        if self.synced or self.blocks is None or self.headers is None:
+            return 0 if self.synced else None
+        rate = self.rate()
+        if not rate:
+            return None
+        return (self.headers - self.blocks) / rate
+
+    def record_run(self) -> None:
+        run = {
+            "finished": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "time_to_synced": round(self.time_to_synced, 1),
+            "start_height": self.run_start_height,
+            "end_height": self.blocks,
+            "bootstrap": self.bootstrap_applied,
+        }
+        self.bootstrap_applied = False
+        try:
+            with open(self.history_path, 'r') as file:
+                runs = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            runs = []
+        runs = (runs + [run])[-self.history_size:]
+        try:
+            with open(self.history_path, 'w') as file:
+                json.dump(runs, file, indent=2)
+        except OSError as e:
+            logging.error(f"Error saving {self.history_path}: {e}")
+
+
+def format_sync_progress(sync: SyncProgress) -> str:
+    """Format the sync state for the Core panel."""
+    if sync.blocks is None or sync.headers is None:
+        return ""
+    if sync.synced:
+        text = f"Synced | Height {sync.blocks}"
+        if sync.time_to_synced is not None:
+            text += f" | Synced in {format_duration(sync.time_to_synced)}"
+        return text
+    text = f"Syncing {sync.blocks}/{sync.headers}"
+    if sync.verification_progress is not None:
+        text += f" | {sync.verification_progress * 100:.2f}%"
+    rate = sync.rate()
+    if rate is not None:
+        text += f" | {rate:.1f} blk/s"
+    eta = sync.eta()
+    if eta is not None:
+        text += f" | ETA {format_duration(eta)}"
+    return text
+
+
+def format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    if hours:
+        return f"{hours}h {minutes:02d}m"
+    if minutes:
+        return f"{minutes}m {seconds:02d}s"
+    return f"{seconds}s"
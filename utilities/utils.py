@@ -119,42 +119,15 @@ def disable_button(button, img=None):
         button.configure(image=img)
 
 
-def processes_check():
-    """Check for running processes related to Blocknet, BlockDX, and Xlite."""
-
+def get_process_target_names():
+    """Return the (blocknet, blockdx, xlite, xlite_daemon) process names to look for."""
     blocknet_bin = global_variables.blocknet_bin
     blockdx_bin = global_variables.blockdx_bin[-1] if global_variables.system == "Darwin" \
         else global_variables.blockdx_bin
     xlite_bin = global_variables.xlite_bin[-1] if global_variables.system == "Darwin" \
         else global_variables.xlite_bin
     xlite_daemon_bin = global_variables.xlite_daemon_bin
-    # Initialize process lists
-    process_lists: dict = {
-        blocknet_bin: [],
-        blockdx_bin: [],
-        xlite_bin: [],
-        xlite_daemon_bin: []
-    }
-
-    # Process all running processes
-    for proc in psutil.process_iter(['pid', 'name', 'status']):
-        pid = proc.info['pid']
-        name = proc.info['name']
-        status = proc.info['status']
-
-        # Check against each target process type
-        for target_name, process_list in process_lists.items():
-            result_pid = handle_process(pid, name, status, target_name)
-            if result_pid is not None:
-                process_list.append(result_pid)
-                break  # Process matched, no need to check other types
-
-    return (
-        process_lists[blocknet_bin],
-        process_lists[blockdx_bin],
-        process_lists[xlite_bin],
-        process_lists[xlite_daemon_bin]
-    )
+    return blocknet_bin, blockdx_bin, xlite_bin, xlite_daemon_bin
 
 
 def handle_process(pid, name, status, target_name):
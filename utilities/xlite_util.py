@@ -2,13 +2,15 @@ import json
 import logging
 import os
 import subprocess
-import threading
 import time
 
-import requests
-
 from utilities import global_variables
+from utilities.async_rpc import run_probe_all
+from utilities.download_manager import PRIORITY_HIGH, download_manager
+from utilities.download_util import remove_digest_sidecar, resumable_download
 from utilities.helper_util import UtilityHelper
+from utilities.process_supervisor import child_exit_watcher
+from utilities.rpc_util import JSONRPCClient
 
 logging.basicConfig(level=logging.DEBUG)
 
@@ -44,9 +46,8 @@ if global_variables.system == 'Windows':
         try:
             installer_name = os.path.basename(url)
 
-            with open(installer_name, 'wb') as file:
-                response = requests.get(url)
-                file.write(response.content)
+            download_manager.run("vc_redist", lambda: resumable_download(url, installer_name), url,
+                                 priority=PRIORITY_HIGH)
 
             command = f"{installer_name} /install /quiet /norestart"
 
@@ -54,42 +55,14 @@ if global_variables.system == 'Windows':
             logging.info("Visual C++ Redistributable installed successfully.")
 
             os.remove(installer_name)
+            remove_digest_sidecar(installer_name)
 
         except Exception as e:
             logging.error(f"Error: {e}")
 
 
-class XliteRPCClient:
-    def __init__(self, rpc_user, rpc_password, rpc_port):
-        self.rpc_user = rpc_user
-        self.rpc_password = rpc_password
-        self.rpc_port = rpc_port
-
-    def send_rpc_request(self, method=None, params=None):
-        url = f"http://localhost:{self.rpc_port}"
-        headers = {'content-type': 'application/json'}
-        auth = (self.rpc_user, self.rpc_password)
-        data = {
-            "jsonrpc": "2.0",
-            "method": method,
-            "params": params if params is not None else [],
-            "id": 1,
-        }
-        try:
-            response = requests.post(url, json=data, headers=headers, auth=auth)
-            if response.status_code != 200:
-                return None
-
-            json_answer = response.json()
-            if 'result' in json_answer:
-                return json_answer['result']
-            else:
-                logging.error(f"No result in json: {json_answer}")
-        except requests.RequestException as e:
-            return None
-        except Exception as ex:
-            logging.exception(f"An unexpected error occurred while sending RPC request: {ex}")
-            return None
+class XliteRPCClient(JSONRPCClient):
+    pass
 
 
 class XliteUtility:
@@ -106,18 +79,17 @@ class XliteUtility:
         self.valid_daemons_rpc_servers = None
         self.xlite_daemon_confs_local = {}
         self.coins_rpc = {}
+        self.coins_rpc_status = {}  # coin -> RPCStatus(up, latency, error)
         self.valid_coins_rpc = False
         self.process_running = None
         self.xlite_process = None
         self.xlite_daemon_process = None
         self.xlite_conf_local = {}
-        self.running = True  # flag for async funcs
         self.xlite_pids = []
         self.xlite_daemon_pids = []
         self.parse_xlite_conf()
         self.parse_xlite_daemon_conf()
         self.downloading_bin = False
-        self.start_threads()
 
     def check_xlite_daemon_confs_sequence(self, silent=True):
         self.parse_xlite_daemon_conf(silent)
@@ -128,37 +100,31 @@ class XliteUtility:
                 password = self.xlite_daemon_confs_local[coin]['rpcPassword']
                 self.coins_rpc[coin] = XliteRPCClient(rpc_user=user, rpc_password=password, rpc_port=port)
 
-    def check_xlite_daemon_confs(self):
-        while self.running and not self.valid_coins_rpc:
+    def probe_xlite_daemon_confs(self) -> bool:
+        """Health probe run by the HealthScheduler, the confs only need reloading until the coins answer."""
+        if not self.valid_coins_rpc:
             self.check_xlite_daemon_confs_sequence(silent=True)
-            time.sleep(10)
-
-    def check_valid_xlite_coins_rpc(self, runonce=False):
-        while self.running:
-            valid = False
-            if self.coins_rpc:
-                for coin, rpc_server in self.coins_rpc.items():
-                    if coin != "master" and coin != "TBLOCK":
-                        if self.xlite_daemon_confs_local[coin]['rpcEnabled'] is True:
-                            res = rpc_server.send_rpc_request("getinfo")
-                            if res is not None:
-                                valid = True
-                        if not valid:
-                            break
-            if valid:
-                self.valid_coins_rpc = True
-            else:
-                self.valid_coins_rpc = False
-            if runonce:
-                return
-
-            time.sleep(5)
-
-    def start_threads(self):
-        thread = threading.Thread(target=self.check_xlite_daemon_confs)
-        thread.start()
-        thread = threading.Thread(target=self.check_valid_xlite_coins_rpc)
-        thread.start()
+        return self.valid_coins_rpc
+
+    def probe_xlite_coins_rpc(self) -> bool:
+        # every enabled coin is probed concurrently, a slow coin no longer delays the others
+        clients = {}
+        for coin, rpc_server in list(self.coins_rpc.items()):
+            if coin == "master" or coin == "TBLOCK":
+                continue
+            coin_conf = self.xlite_daemon_confs_local.get(coin)
+            if isinstance(coin_conf, dict) and coin_conf.get('rpcEnabled') is True:
+                clients[coin] = rpc_server
+        self.coins_rpc_status = run_probe_all(clients, "getinfo")
+        down = [coin for coin, status in self.coins_rpc_status.items() if not status.up]
+        if down:
+            logging.debug(f"XLITE-DAEMON: coins rpc down: {down}")
+        self.valid_coins_rpc = bool(self.coins_rpc_status) and not down
+        return self.valid_coins_rpc
+
+    def reset_xlite_coins_rpc_status(self):
+        self.coins_rpc_status = {}
+        self.valid_coins_rpc = False
 
     def parse_xlite_conf(self):
         data_folder = os.path.expandvars(
@@ -214,7 +180,8 @@ class XliteUtility:
 
         if not os.path.exists(self.xlite_exe):
             logging.info(f"Xlite executable not found at {self.xlite_exe}. Downloading...")
-            self.download_xlite_bin()
+            # joins the download already running from the Download button, if any
+            download_manager.run("xlite", self.download_xlite_bin, global_variables.xlite_release_url)
 
         try:
             if global_variables.system == "Darwin":
@@ -238,43 +205,20 @@ class XliteUtility:
                 time.sleep(1)
 
             pid = self.xlite_process.pid
+            child_exit_watcher.watch("xlite", self.xlite_process)
             logging.info(f"Started Xlite process with PID {pid}: {self.xlite_exe}")
         except Exception as e:
             logging.error(f"Error: {e}")
 
     def close_xlite(self):
-        if self.xlite_process:
-            try:
-                self.xlite_process.terminate()
-                self.xlite_process.wait(timeout=10)
-                logging.info(f"Closed Xlite")
-                self.xlite_process = None
-            except subprocess.TimeoutExpired:
-                logging.info(f"Force terminating Xlite")
-                self.kill_xlite()
-                logging.info(f"Xlite has been force terminated.")
-                self.xlite_process = None
-            except Exception as e:
-                logging.error(f"Error: {e}")
-        else:
-            self.close_xlite_pids()
-        self.close_xlite_daemon_pids()
-
-    def kill_xlite(self):
-        if self.xlite_process:
-            try:
-                self.xlite_process.kill()
-                logging.info(f"Killed Xlite")
-                self.xlite_process = None
-                return
-            except Exception as e:
-                logging.error(f"Error: {e}")
-
-    def close_xlite_pids(self):
-        self.helper.terminate_processes(self.xlite_pids, "XLite")
-
-    def close_xlite_daemon_pids(self):
-        self.helper.terminate_processes(self.xlite_daemon_pids, "Xlite-daemon")
+        # XLite and its daemons are signaled together and share one deadline
+        xlite_pids = [self.xlite_process.pid] if self.xlite_process else self.xlite_pids
+        try:
+            self.helper.terminate_process_groups({"XLite": xlite_pids, "Xlite-daemon": self.xlite_daemon_pids})
+            logging.info(f"Closed Xlite")
+            self.xlite_process = None
+        except Exception as e:
+            logging.error(f"Error: {e}")
 
     def download_xlite_bin(self):
         self.downloading_bin = True
@@ -0,0 +1,129 @@
+import binascii
+import logging
+import struct
+import threading
+import time
+
+try:
+    import zmq
+except ImportError:
+    zmq = None
+
+
+def zmq_available() -> bool:
+    return zmq is not None
+
+
+class ChainTip:
+    """Last known chain tip of Blocknet Core, fed by ZMQ events or by RPC polling."""
+
+    def __init__(self):
+        self.height = None
+        self.block_hash = None
+        self.tip_time = None  # local time the tip changed
+        self.tx_count: int = 0  # transactions announced since the tip changed
+        self.source = None  # 'zmq' or 'rpc'
+
+    def set_tip(self, block_hash: str, height, source: str) -> bool:
+        """Return True when the tip changed."""
+        if block_hash == self.block_hash and height == self.height:
+            return False
+        self.block_hash = block_hash
+        self.height = height
+        self.tip_time = time.time()
+        self.tx_count = 0
+        self.source = source
+        return True
+
+    def reset(self) -> None:
+        self.__init__()
+
+
+class ZMQBlockListener:
+    """
+    Subscribes to the hashblock / hashtx publishers of Blocknet Core.
+    on_block(block_hash) and on_tx(tx_hash) are called from the listener thread.
+    The listener counts as live only while events keep coming, callers fall back to RPC polling otherwise.
+    """
+
+    def __init__(self, address: str, on_block=None, on_tx=None, stale_after: float = 300):
+        self.address: str = address
+        self.on_block = on_block
+        self.on_tx = on_tx
+        self.stale_after: float = stale_after
+        self.last_event: float = 0
+        self.last_sequence: dict = {}  # topic -> sequence number, gaps mean dropped notifications
+        self.missed: int = 0
+        self.running: bool = False
+        self.thread = None
+
+    def start(self) -> bool:
+        if zmq is None:
+            logging.warning("ZMQ: pyzmq not installed, block notifications fall back to RPC polling")
+            return False
+        if self.running:
+            return True
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="ZMQBlockListener", daemon=True)
+        self.thread.start()
+        return True
+
+    def stop(self) -> None:
+        self.running = False
+
+    def is_live(self) -> bool:
+        return self.running and time.monotonic() - self.last_event < self.stale_after
+
+    def _run(self) -> None:
+        context = zmq.Context.instance()
+        socket = context.socket(zmq.SUB)
+        socket.setsockopt(zmq.LINGER, 0)
+        socket.setsockopt(zmq.RCVTIMEO, 1000)  # wake up regularly to notice stop()
+        socket.setsockopt(zmq.SUBSCRIBE, b"hashblock")
+        socket.setsockopt(zmq.SUBSCRIBE, b"hashtx")
+        socket.connect(self.address)
+        logging.info(f"ZMQ: subscribed to {self.address}")
+        try:
+            while self.running:
+                try:
+                    frames = socket.recv_multipart()
+                except zmq.Again:
+                    continue
+                self._handle(frames)
+        except zmq.ZMQError as e:
+            logging.error(f"ZMQ: listener stopped: {e}")
+        finally:
+            socket.close()
+            self.running = False
+
+    def _handle(self, frames: list) -> None:
+        if len(frames) < 2:
+            return
+        topic, body = frames[0], frames[1]
+        self.last_event = time.monotonic()
+        if len(frames) >= 3 and len(frames[2]) == 4:
+            sequence = struct.unpack('<I', frames[2])[0]
+            previous = self.last_sequence.get(topic)
+            if previous is not None and sequence > previous + 1:
+                self.missed += sequence - previous - 1
+            self.last_sequence[topic] = sequence
+        value = binascii.hexlify(body).decode()
+        try:
+            if topic == b"hashblock" and self.on_block:
+                self.on_block(value)
+            elif topic == b"hashtx" and self.on_tx:
+                self.on_tx(value)
+        except Exception as e:
+            logging.error(f"ZMQ: {topic.decode()} handler failed: {e}")
+
+
+def format_chain_tip(tip: ChainTip) -> str:
+    """Format the chain tip for the Core panel."""
+    if tip.block_hash is None:
+        return ""
+    text = f"Block {tip.height if tip.height is not None else '?'} | Tip {tip.block_hash[:12]}"
+    if tip.tip_time:
+        text += f" | {int(time.time() - tip.tip_time)}s ago"
+    if tip.source == 'zmq':
+        text += f" | {tip.tx_count} tx | ZMQ"
+    return text
@@ -46,5 +46,10 @@ xlite_daemon_not_running_string = "XLite-daemon\nnot running"
 xlite_daemon_valid_config_string = "XLite-daemon config\nfound"
 xlite_daemon_not_valid_config_string = "XLite-daemon config\nnot found"
 xlite_reverse_proxy_not_running_string = "XLite-reverse-proxy:\nnot running"
+auto_restart_blocknet_string = "Auto-restart Blocknet"
+auto_restart_xlite_daemon_string = "Auto-restart XLite-daemon"
+zmq_notifications_string = "ZMQ block notifications"
+loading_panel_string = "Loading..."
+loading_panel_failed_string = "Failed to load, see the log for details."
 xlite_store_password_string = "Store Password"
 xlite_stored_password_string = "Password Stored"